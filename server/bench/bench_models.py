@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+帖子归一化基准测试
+用 fixtures/ 中录制的响应拼出一大批帖子，对比 social_models 的 __slots__ 模型
+和各 helper 以前手写的 dict，测量：
+- 归一化吞吐（帖子/秒）
+- 每个帖子占用的内存（tracemalloc）
+- 归一化 + JSON 序列化的端到端吞吐（旧：json.dumps(list of dict)，新：social_models.dumps）
+- 归一化 + 序列化过程中的内存峰值（tracemalloc peak，含输出的 JSON 字符串）
+
+用法：
+    python3 server/bench/bench_models.py --posts 5000 --repeat 9
+"""
+import sys
+import gc
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+from datetime import datetime
+from html import unescape
+import re
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+sys.path.insert(0, str(SERVER_DIR))
+import social_models
+
+# ---------- 以前各 helper 手写的 dict（对照组） ----------
+
+def legacy_strip_html(html_text):
+    if not html_text:
+        return ''
+    text = re.sub(r'<[^>]+>', '', html_text)
+    text = unescape(text)
+    return text.strip()
+
+def legacy_truthsocial(statuses):
+    """truthsocial_api_helper 以前的转换"""
+    posts = []
+    for status in statuses:
+        post = {
+            'id': status.get('id', ''),
+            'text': legacy_strip_html(status.get('content', '')),
+            'created_at': status.get('created_at', ''),
+            'reblogs_count': status.get('reblogs_count', 0),
+            'favourites_count': status.get('favourites_count', 0),
+            'replies_count': status.get('replies_count', 0),
+            'url': status.get('url', ''),
+        }
+        media_attachments = status.get('media_attachments', [])
+        if media_attachments:
+            post['media'] = [{'type': m.get('type', 'image'), 'url': m.get('url', '')} for m in media_attachments]
+        posts.append(post)
+    return posts
+
+def legacy_twitter_graphql(tweet_results):
+    """twitter_api_helper 以前的转换"""
+    tweets = []
+    for tweet_data in tweet_results:
+        legacy = tweet_data.get('legacy', {})
+        tweet = {
+            'id': legacy.get('id_str', tweet_data.get('rest_id', '')),
+            'text': legacy.get('full_text', ''),
+            'created_at': legacy.get('created_at', ''),
+            'retweet_count': legacy.get('retweet_count', 0),
+            'favorite_count': legacy.get('favorite_count', 0),
+            'reply_count': legacy.get('reply_count', 0),
+            'quote_count': legacy.get('quote_count', 0),
+            'is_retweet': bool(legacy.get('retweeted_status_result')),
+            'is_reply': bool(legacy.get('in_reply_to_status_id_str')),
+        }
+        media = legacy.get('entities', {}).get('media', [])
+        if media:
+            tweet['media'] = [{'type': m.get('type', 'photo'), 'url': m.get('media_url_https', m.get('media_url', ''))} for m in media]
+        tweets.append(tweet)
+    return tweets
+
+def legacy_twikit(tweets, user):
+    """twitter_helper 以前的转换（hasattr 链 + 每条推文一份用户信息）"""
+    tweet_list = []
+    for tweet in tweets:
+        tweet_data = {
+            'id': tweet.id,
+            'text': tweet.text,
+            'created_at': str(tweet.created_at) if hasattr(tweet, 'created_at') else '',
+            'retweet_count': tweet.retweet_count if hasattr(tweet, 'retweet_count') else 0,
+            'favorite_count': tweet.favorite_count if hasattr(tweet, 'favorite_count') else 0,
+            'reply_count': tweet.reply_count if hasattr(tweet, 'reply_count') else 0,
+            'quote_count': tweet.quote_count if hasattr(tweet, 'quote_count') else 0,
+            'is_retweet': hasattr(tweet, 'retweeted_tweet') and tweet.retweeted_tweet is not None,
+            'is_reply': hasattr(tweet, 'in_reply_to_user_id') and tweet.in_reply_to_user_id is not None,
+            'user': {
+                'screen_name': user.screen_name,
+                'name': user.name,
+                'followers_count': user.followers_count if hasattr(user, 'followers_count') else 0,
+                'verified': user.verified if hasattr(user, 'verified') else False,
+            }
+        }
+        if hasattr(tweet, 'media') and tweet.media:
+            tweet_data['media'] = []
+            for media in tweet.media:
+                media_obj = {'type': 'photo', 'url': ''}
+                if hasattr(media, 'type'):
+                    media_obj['type'] = media.type
+                if hasattr(media, 'media_url_https'):
+                    media_obj['url'] = media.media_url_https
+                elif hasattr(media, 'url'):
+                    media_obj['url'] = media.url
+                tweet_data['media'].append(media_obj)
+        tweet_list.append(tweet_data)
+    return tweet_list
+
+# ---------- 测试数据 ----------
+
+def load_json(name):
+    return json.loads((FIXTURES_DIR / name).read_text())
+
+def replicate(items, count):
+    """把录制的一页数据重复到 count 条（共享原始 dict，归一化不会修改它们）"""
+    return [items[i % len(items)] for i in range(count)]
+
+def twitter_tweet_results():
+    """从 UserTweets 时间线中取出 tweet result"""
+    timeline = load_json('twitter/user_tweets.json')
+    entries = timeline['data']['user']['result']['timeline_v2']['timeline']['instructions'][-1]['entries']
+    return [e['content']['itemContent']['tweet_results']['result'] for e in entries if e['entryId'].startswith('tweet-')]
+
+def build_cases(count):
+    """每个数据源：(原始数据, 旧转换, 新转换)"""
+    statuses = replicate(load_json('truthsocial/statuses.json'), count)
+    ts_author = social_models.user_from_mastodon(load_json('truthsocial/lookup.json'))
+
+    tweet_results = replicate(twitter_tweet_results(), count)
+    tw_user_result = load_json('twitter/user_by_screen_name.json')['data']['user']['result']
+    tw_author = social_models.user_from_twitter_graphql(tw_user_result)
+
+    cases = {
+        'truthsocial': (
+            statuses,
+            legacy_truthsocial,
+            lambda batch: [social_models.post_from_mastodon(s, ts_author) for s in batch],
+        ),
+        'twitter_graphql': (
+            tweet_results,
+            legacy_twitter_graphql,
+            lambda batch: [social_models.post_from_twitter_graphql(t, tw_author) for t in batch],
+        ),
+    }
+
+    try:
+        from twikit.tweet import Tweet
+        from twikit.user import User
+    except ImportError:
+        print('twikit not installed, skipping twikit case', file=sys.stderr)
+        return cases
+
+    twikit_user = User(None, tw_user_result)
+    tweets = [Tweet(None, t, twikit_user) for t in tweet_results]
+    twikit_author = social_models.user_from_twikit(twikit_user)
+    cases['twikit'] = (
+        tweets,
+        lambda batch: legacy_twikit(batch, twikit_user),
+        lambda batch: [social_models.post_from_twikit(t, twikit_author) for t in batch],
+    )
+    return cases
+
+# ---------- 测量 ----------
+
+def paired_times(legacy_fn, model_fn, batch, repeat):
+    """旧转换和新模型交替运行，两边经历同样的机器噪声；返回各自的耗时列表"""
+    legacy_times, model_times = [], []
+    for _ in range(repeat):
+        for fn, times in ((legacy_fn, legacy_times), (model_fn, model_times)):
+            gc.collect()
+            start = time.perf_counter()
+            fn(batch)
+            times.append(time.perf_counter() - start)
+    return legacy_times, model_times
+
+def bytes_per_post(fn, batch):
+    """归一化结果（列表 + 帖子对象）常驻内存 / 帖子数"""
+    gc.collect()
+    tracemalloc.start()
+    result = fn(batch)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / len(batch)
+
+def peak_bytes(fn, batch):
+    """运行 fn(batch) 期间 tracemalloc 记录的内存峰值"""
+    gc.collect()
+    tracemalloc.start()
+    result = fn(batch)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+def compare(legacy_fn, model_fn, legacy_serialize, model_serialize, batch, repeat):
+    """归一化和端到端各做一组交替计时；吞吐取最快的一次，变化取每轮比值的中位数（对噪声更稳）"""
+    result = {'legacy_dict': {}, 'slots_model': {}, 'change_pct': {}}
+    legacy_end_to_end = lambda b: legacy_serialize(legacy_fn(b))
+    model_end_to_end = lambda b: model_serialize(model_fn(b))
+    pairs = {
+        'normalize_posts_per_s': (legacy_fn, model_fn),
+        'end_to_end_posts_per_s': (legacy_end_to_end, model_end_to_end),
+    }
+    for key, (legacy, model) in pairs.items():
+        legacy_times, model_times = paired_times(legacy, model, batch, repeat)
+        result['legacy_dict'][key] = round(len(batch) / min(legacy_times))
+        result['slots_model'][key] = round(len(batch) / min(model_times))
+        ratios = [old / new for old, new in zip(legacy_times, model_times)]
+        result['change_pct'][key] = round((statistics.median(ratios) - 1) * 100, 1)
+
+    legacy_bytes = bytes_per_post(legacy_fn, batch)
+    model_bytes = bytes_per_post(model_fn, batch)
+    result['legacy_dict']['bytes_per_post'] = round(legacy_bytes)
+    result['slots_model']['bytes_per_post'] = round(model_bytes)
+    result['change_pct']['bytes_per_post'] = round((model_bytes - legacy_bytes) / legacy_bytes * 100, 1)
+
+    legacy_peak = peak_bytes(legacy_end_to_end, batch)
+    model_peak = peak_bytes(model_end_to_end, batch)
+    result['legacy_dict']['end_to_end_peak_kb'] = round(legacy_peak / 1024)
+    result['slots_model']['end_to_end_peak_kb'] = round(model_peak / 1024)
+    result['change_pct']['end_to_end_peak_kb'] = round((model_peak - legacy_peak) / legacy_peak * 100, 1)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark post normalization')
+    parser.add_argument('--posts', type=int, default=5000, help='posts per batch')
+    parser.add_argument('--repeat', type=int, default=9, help='interleaved timing repeats')
+    parser.add_argument('--output', help='result file (default: results/models-<timestamp>.json)')
+    options = parser.parse_args()
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'posts': options.posts,
+            'repeat': options.repeat,
+        },
+        'sources': {},
+    }
+
+    for source, (batch, legacy_fn, model_fn) in build_cases(options.posts).items():
+        result = compare(
+            legacy_fn, model_fn,
+            lambda posts: json.dumps({'success': True, 'posts': posts}),
+            lambda posts: social_models.dumps(social_models.posts_result(posts)),
+            batch, options.repeat,
+        )
+        results['sources'][source] = result
+
+        print(f'{source} ({options.posts} posts)')
+        for key in ('normalize_posts_per_s', 'end_to_end_posts_per_s', 'bytes_per_post', 'end_to_end_peak_kb'):
+            legacy, model = result['legacy_dict'][key], result['slots_model'][key]
+            print(f"  {key:<24} {legacy:>10} -> {model:>10} ({result['change_pct'][key]:+.1f}%)")
+
+    output = Path(options.output) if options.output else RESULTS_DIR / f"models-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + '\n')
+    print(f'\nResults saved to {output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"use strict";(self.webpackChunk_twitter_responsive_web=self.webpackChunk_twitter_responsive_web||[]).push([["ondemand.s"],{12345:(e,t,n)=>{n.d(t,{default:()=>r});const r=()=>{const o=[];return o.push((n[2], 16)),o.push((n[12], 16)),o.push((n[14], 16)),o.push((n[7], 16)),o}}}]);
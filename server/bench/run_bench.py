@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+社交媒体 helper 离线基准测试
+启动本地替身服务器（standin_server.py），以子进程方式运行每个 helper（与线上调用方式一致），测量：
+- 冷启动：解释器启动 + 导入 + 命令分发（不发网络请求）
+- 每个命令的延迟 p50 / p90 / 最大值（样本数 >= 100 时才报告 p99，样本太少时 p99 就是最大值）
+- 并发下的吞吐量
+- 峰值 RSS
+结果保存为 JSON，可用 --compare 与之前的结果对比；结果里记录 fixtures 的摘要，
+fixtures 改过之后（例如 caae849 改写了 statuses.json / user_tweets.json）对比会给出提示，
+因为两次测的已经不是同一份数据
+
+用法：
+    python3 server/bench/run_bench.py --iterations 20 --latency-ms 80 --jitter-ms 20
+    python3 server/bench/run_bench.py --compare server/bench/results/bench-20261019-120000.json
+"""
+import sys
+import os
+import json
+import hashlib
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from standin_server import start_server, add_network_options, FIXTURES_DIR
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+HANDLE = 'realDonaldTrump'
+
+# helper 脚本及其要测量的命令
+HELPERS = {
+    'truth_social_helper': {
+        'script': 'truth_social_helper.py',
+        'commands': [['get_posts', HANDLE, '20'], ['get_user_info', HANDLE], ['health', '--force'], ['health']],
+    },
+    'truth_social_cffi': {
+        'script': 'truth_social_cffi.py',
+        'commands': [['get_posts', HANDLE, '20']],
+    },
+    'truthsocial_api_helper': {
+        'script': 'truthsocial_api_helper.py',
+        'commands': [['get_posts', HANDLE, '20']],
+    },
+    'twitter_helper': {
+        'script': 'twitter_helper.py',
+        'commands': [['get_tweets', HANDLE, '20'], ['get_user_info', HANDLE], ['health', '--force'], ['health']],
+    },
+    'twitter_api_helper': {
+        'script': 'twitter_api_helper.py',
+        # data_api 客户端的地址无法重定向到替身服务器，只测冷启动
+        'commands': [],
+        'note': 'data_api cannot be pointed at the stand-in; cold start only',
+    },
+    'person_feed_helper': {
+        'script': 'person_feed_helper.py',
+        # 两个平台并发抓取，延迟应接近 twitter_helper 和 truth_social_helper 中较慢的一个
+        'commands': [['get_person_feed', HANDLE, HANDLE, '20']],
+    },
+}
+
+# 样本数达到这个值才报告 p99
+MIN_RUNS_FOR_P99 = 100
+
+# 不会触发网络请求的命令，用来测冷启动
+NOOP_ARGS = ['__bench_noop__', HANDLE]
+
+def run_once(script, args, env):
+    """运行一次 helper，返回耗时、峰值 RSS（KB）、退出码和输出"""
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, str(SERVER_DIR / script), *args],
+            stdout=out,
+            stderr=err,
+            env=env,
+        )
+        # 用 wait4 回收子进程，才能拿到该子进程自己的 ru_maxrss
+        _, status, usage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+        out.seek(0)
+        err.seek(0)
+        return {
+            'elapsed': elapsed,
+            'max_rss_kb': usage.ru_maxrss,
+            'returncode': proc.returncode,
+            'stdout': out.read().decode('utf-8', 'replace'),
+            'stderr': err.read().decode('utf-8', 'replace'),
+        }
+
+def is_success(run):
+    """helper 的输出格式各不相同：success 包装、错误字典或裸列表"""
+    if run['returncode'] != 0:
+        return False
+    try:
+        result = json.loads(run['stdout'])
+    except ValueError:
+        return False
+    if isinstance(result, dict):
+        return bool(result.get('success', True)) and 'error' not in result
+    return isinstance(result, list) and len(result) > 0
+
+def error_of(run):
+    """从一次失败的运行中提取简短的错误信息"""
+    lines = (run['stderr'].strip() or run['stdout'].strip()).splitlines()
+    return lines[-1][:200] if lines else f'exit code {run["returncode"]}'
+
+def percentile(values, pct):
+    """线性插值百分位数"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+def summarize(runs):
+    """把多次运行汇总为延迟分位数、错误数和峰值 RSS"""
+    latencies = [r['elapsed'] * 1000 for r in runs]
+    failures = [r for r in runs if not is_success(r)]
+    summary = {
+        'runs': len(runs),
+        'errors': len(failures),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p90_ms': round(percentile(latencies, 90), 2),
+        'max_ms': round(max(latencies), 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'max_rss_mb': round(max(r['max_rss_kb'] for r in runs) / 1024, 2),
+    }
+    if len(runs) >= MIN_RUNS_FOR_P99:
+        summary['p99_ms'] = round(percentile(latencies, 99), 2)
+    if failures:
+        summary['first_error'] = error_of(failures[0])
+    return summary
+
+def is_missing_dependency(run):
+    """冷启动时缺少依赖（curl_cffi / twikit / truthbrush / data_api）"""
+    return (
+        'ModuleNotFoundError' in run['stderr']
+        or 'ImportError' in run['stderr']
+        or 'not installed' in run['stdout']
+    )
+
+def bench_helper(spec, env, options):
+    """测量一个 helper 的冷启动、命令延迟、并发吞吐和峰值 RSS"""
+    script = spec['script']
+    result = {'script': script}
+    if spec.get('note'):
+        result['note'] = spec['note']
+
+    cold_runs = [run_once(script, NOOP_ARGS, env) for _ in range(options.cold_runs)]
+    if is_missing_dependency(cold_runs[0]):
+        result['skipped'] = error_of(cold_runs[0])
+        return result
+
+    cold_latencies = [r['elapsed'] * 1000 for r in cold_runs]
+    result['cold_start'] = {
+        'first_ms': round(cold_latencies[0], 2),
+        'p50_ms': round(percentile(cold_latencies, 50), 2),
+        'max_rss_mb': round(max(r['max_rss_kb'] for r in cold_runs) / 1024, 2),
+    }
+    all_runs = list(cold_runs)
+
+    result['commands'] = {}
+    for args in spec['commands']:
+        runs = [run_once(script, args, env) for _ in range(options.iterations)]
+        result['commands'][' '.join(args)] = summarize(runs)
+        all_runs.extend(runs)
+
+    if spec['commands'] and options.throughput_runs > 0:
+        args = spec['commands'][0]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+            runs = list(pool.map(lambda _: run_once(script, args, env), range(options.throughput_runs)))
+        wall = time.perf_counter() - start
+        result['throughput'] = {
+            'command': ' '.join(args),
+            'concurrency': options.concurrency,
+            'wall_s': round(wall, 3),
+            'runs_per_s': round(len(runs) / wall, 2),
+            **summarize(runs),
+        }
+        all_runs.extend(runs)
+
+    result['peak_rss_mb'] = round(max(r['max_rss_kb'] for r in all_runs) / 1024, 2)
+    return result
+
+def build_env(base_url, cookies_file, health_file):
+    """把所有 helper 指向替身服务器，并提供假的凭证和独立的健康状态文件"""
+    env = dict(os.environ)
+    env.update({
+        'TRUTHSOCIAL_BASE_URL': base_url,
+        'TRUTHSOCIAL_ACCESS_TOKEN': 'bench-token',
+        'TRUTHSOCIAL_TOKEN': 'bench-token',
+        'TWITTER_BASE_URL': base_url,
+        'TWITTER_COOKIES_FILE': cookies_file,
+        'SOCIAL_HEALTH_FILE': health_file,
+    })
+    return env
+
+def fixtures_digest():
+    """所有 fixture 文件内容的摘要，用来判断两次结果是否基于同一份回放数据"""
+    digest = hashlib.sha256()
+    for path in sorted(FIXTURES_DIR.rglob('*')):
+        if path.is_file():
+            digest.update(str(path.relative_to(FIXTURES_DIR)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+def git_commit():
+    """当前提交，便于对比不同版本的结果"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=SERVER_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(previous, current):
+    """打印两次结果之间的 p50 / p90 / p99 / 峰值 RSS 变化（p99 只在两边都有时对比）"""
+    def delta(old, new):
+        if old is None or new is None:
+            return 'n/a'
+        change = (new - old) / old * 100 if old else 0.0
+        return f'{old:>9.2f} -> {new:>9.2f} ({change:+.1f}%)'
+
+    print(f"\nComparison against {previous['meta'].get('timestamp')} ({previous['meta'].get('git_commit')})")
+    if previous['meta'].get('fixtures') != current['meta']['fixtures']:
+        print('WARNING: the fixtures differ from the previous run (or it predates fixture tracking); '
+              'latency and throughput were measured on different data')
+    for name, new in current['helpers'].items():
+        old = previous['helpers'].get(name)
+        if not old or 'skipped' in old or 'skipped' in new:
+            continue
+        print(f'{name}')
+        print(f"  cold start p50 ms  {delta(old['cold_start']['p50_ms'], new['cold_start']['p50_ms'])}")
+        for command, stats in new['commands'].items():
+            old_stats = old.get('commands', {}).get(command)
+            if not old_stats:
+                continue
+            for key in ('p50_ms', 'p90_ms', 'p99_ms'):
+                if key in old_stats and key in stats:
+                    print(f"  {command} {key[:3]} ms  {delta(old_stats[key], stats[key])}")
+        if 'throughput' in old and 'throughput' in new:
+            print(f"  throughput runs/s  {delta(old['throughput']['runs_per_s'], new['throughput']['runs_per_s'])}")
+        print(f"  peak RSS MB        {delta(old.get('peak_rss_mb'), new.get('peak_rss_mb'))}")
+
+def print_summary(results):
+    """打印结果摘要"""
+    for name, result in results['helpers'].items():
+        if 'skipped' in result:
+            print(f"{name}: skipped ({result['skipped']})")
+            continue
+        cold = result['cold_start']
+        print(f"{name}: cold start p50 {cold['p50_ms']} ms, peak RSS {result['peak_rss_mb']} MB")
+        for command, stats in result['commands'].items():
+            p99 = f", p99 {stats['p99_ms']} ms" if 'p99_ms' in stats else ''
+            print(f"  {command}: p50 {stats['p50_ms']} ms, p90 {stats['p90_ms']} ms{p99}, max {stats['max_ms']} ms, "
+                  f"errors {stats['errors']}/{stats['runs']}")
+        if 'throughput' in result:
+            t = result['throughput']
+            print(f"  throughput x{t['concurrency']}: {t['runs_per_s']} runs/s, errors {t['errors']}/{t['runs']}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Offline benchmark for the social media helpers')
+    parser.add_argument('--iterations', type=int, default=20,
+                        help=f'sequential runs per command (p99 is reported from {MIN_RUNS_FOR_P99} runs)')
+    parser.add_argument('--cold-runs', type=int, default=5, help='runs of the no-op command for cold start')
+    parser.add_argument('--concurrency', type=int, default=8, help='parallel helper processes for throughput')
+    parser.add_argument('--throughput-runs', type=int, default=32, help='total runs for throughput (0 = skip)')
+    parser.add_argument('--only', nargs='+', choices=sorted(HELPERS), help='benchmark only these helpers')
+    parser.add_argument('--output', help='result file (default: results/bench-<timestamp>.json)')
+    parser.add_argument('--compare', help='previous result file to compare against')
+    add_network_options(parser)
+    return parser
+
+def main():
+    options = build_parser().parse_args()
+    server = start_server(options)
+
+    state_dir = tempfile.TemporaryDirectory()
+    cookies_file = os.path.join(state_dir.name, 'twitter_cookies.json')
+    with open(cookies_file, 'w') as f:
+        json.dump({'auth_token': 'bench-auth-token', 'ct0': 'bench-ct0'}, f)
+
+    try:
+        env = build_env(server.base_url, cookies_file, os.path.join(state_dir.name, 'social_health.json'))
+        helpers = {}
+        for name, spec in HELPERS.items():
+            if options.only and name not in options.only:
+                continue
+            print(f'Benchmarking {name}...', file=sys.stderr)
+            helpers[name] = bench_helper(spec, env, options)
+    finally:
+        server.shutdown()
+        server.server_close()
+        state_dir.cleanup()
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'fixtures': fixtures_digest(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'requests_served': server.requests_served,
+            'options': {k: v for k, v in vars(options).items() if k not in ('output', 'compare')},
+        },
+        'helpers': helpers,
+    }
+
+    output = Path(options.output) if options.output else RESULTS_DIR / f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + '\n')
+
+    print_summary(results)
+    print(f'\nResults saved to {output}')
+
+    if options.compare:
+        compare(json.loads(Path(options.compare).read_text()), results)
+
+if __name__ == '__main__':
+    main()
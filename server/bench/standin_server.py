@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Truth Social / Twitter 本地替身服务器
+回放 fixtures/ 下录制的 lookup、statuses、timeline 和凭证检查响应，供基准测试离线使用
+支持可配置的延迟、抖动、429 比例和慢速响应体
+
+用法：
+    python3 standin_server.py --port 8787 --latency-ms 80 --jitter-ms 20 --rate-429 0.05
+然后把 helper 指向它：
+    TRUTHSOCIAL_BASE_URL=http://127.0.0.1:8787 TWITTER_BASE_URL=http://127.0.0.1:8787
+"""
+import json
+import re
+import time
+import random
+import argparse
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+# (路径正则, fixture 文件, Content-Type)
+ROUTES = [
+    # Truth Social (Mastodon API)
+    (re.compile(r'^/api/v1/accounts/lookup$'), 'truthsocial/lookup.json', 'application/json'),
+    (re.compile(r'^/api/v1/accounts/\d+/statuses$'), 'truthsocial/statuses.json', 'application/json'),
+    (re.compile(r'^/api/v1/accounts/verify_credentials$'), 'truthsocial/verify_credentials.json', 'application/json'),
+    # Twitter GraphQL
+    (re.compile(r'^/i/api/graphql/[\w-]+/UserByScreenName$'), 'twitter/user_by_screen_name.json', 'application/json'),
+    (re.compile(r'^/i/api/graphql/[\w-]+/UserTweets$'), 'twitter/user_tweets.json', 'application/json'),
+    (re.compile(r'^/1\.1/account/settings\.json$'), 'twitter/account_settings.json', 'application/json'),
+    # twikit 生成 X-Client-Transaction-Id 前会抓取首页和 ondemand 脚本
+    (re.compile(r'^/?$'), 'twitter/home.html', 'text/html; charset=utf-8'),
+    (re.compile(r'^/responsive-web/client-web/ondemand\.s\.\w+\.js$'), 'twitter/ondemand.js', 'application/javascript'),
+]
+
+def load_fixtures():
+    """把所有 fixture 读入内存，避免请求路径上的磁盘 IO"""
+    return {fixture: (FIXTURES_DIR / fixture).read_bytes() for _, fixture, _ in ROUTES}
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """按路径回放 fixture，并按服务器配置注入延迟、429 和慢速响应体"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        options = self.server.options
+        url = urlsplit(self.path)
+
+        self.server.count_request()
+        time.sleep(self.server.next_delay())
+
+        if self.server.should_throttle():
+            self.send_body(429, b'{"error":"Too many requests"}', 'application/json',
+                           extra_headers={'Retry-After': '1'})
+            return
+
+        for pattern, fixture, content_type in ROUTES:
+            if pattern.match(url.path):
+                body = self.server.fixtures[fixture]
+                # 只录制了一页帖子，翻页请求返回空列表让客户端停止
+                if fixture == 'truthsocial/statuses.json' and 'max_id' in parse_qs(url.query):
+                    body = b'[]'
+                self.send_body(200, body, content_type,
+                               chunk_size=options.chunk_size, chunk_delay=options.chunk_delay_ms / 1000)
+                return
+
+        self.send_body(404, json.dumps({'error': f'No fixture for {url.path}'}).encode(), 'application/json')
+
+    def send_body(self, status, body, content_type, extra_headers=None, chunk_size=0, chunk_delay=0):
+        """发送响应；chunk_size > 0 时分块写出并在块之间等待，模拟慢速响应体"""
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        if chunk_size <= 0:
+            self.wfile.write(body)
+            return
+
+        for offset in range(0, len(body), chunk_size):
+            self.wfile.write(body[offset:offset + chunk_size])
+            self.wfile.flush()
+            if offset + chunk_size < len(body):
+                time.sleep(chunk_delay)
+
+    def log_message(self, format, *args):
+        if getattr(self.server.options, 'verbose', False):
+            super().log_message(format, *args)
+
+class StandinServer(ThreadingHTTPServer):
+    """带回放配置和请求计数的 HTTP 服务器"""
+
+    daemon_threads = True
+
+    def __init__(self, address, options):
+        super().__init__(address, StandinHandler)
+        self.options = options
+        self.fixtures = load_fixtures()
+        self.requests_served = 0
+        self._random = random.Random(options.seed)
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def count_request(self):
+        with self._lock:
+            self.requests_served += 1
+
+    def next_delay(self):
+        """基础延迟加上 [-jitter, +jitter] 的均匀抖动（秒）"""
+        with self._lock:
+            jitter = self._random.uniform(-self.options.jitter_ms, self.options.jitter_ms)
+        return max(0.0, self.options.latency_ms + jitter) / 1000
+
+    def should_throttle(self):
+        with self._lock:
+            return self._random.random() < self.options.rate_429
+
+def build_parser():
+    """命令行参数，run_bench.py 复用同一组选项"""
+    parser = argparse.ArgumentParser(description='Truth Social / Twitter local stand-in server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    add_network_options(parser)
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    return parser
+
+def add_network_options(parser):
+    """延迟、抖动、429 和慢速响应体选项"""
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='base response latency')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='uniform +/- jitter added to latency')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='fraction of requests answered with 429')
+    parser.add_argument('--chunk-size', type=int, default=0, help='send bodies in chunks of this many bytes (0 = at once)')
+    parser.add_argument('--chunk-delay-ms', type=float, default=0.0, help='pause between body chunks')
+    parser.add_argument('--seed', type=int, default=0, help='seed for jitter and 429 injection')
+
+def start_server(options, host='127.0.0.1', port=0):
+    """在后台线程启动替身服务器，port=0 时自动分配端口"""
+    server = StandinServer((host, port), options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def main():
+    options = build_parser().parse_args()
+    server = StandinServer((options.host, options.port), options)
+    print(json.dumps({'listening': server.base_url}), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
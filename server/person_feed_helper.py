@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Person Feed Helper Script
+同时在 Twitter 和 Truth Social 都有账号的人物（如 Trump、Warsh）：在一个进程里并发抓取两个平台
+（twikit 的 asyncio 客户端 + curl_cffi 的异步会话），总耗时取决于较慢的一边而不是两边相加；
+再按时间做 k 路归并，并用近似重复文本哈希（词对 shingle 哈希 + Jaccard 相似度）折叠两个平台之间的同文转发
+"""
+import sys
+import json
+import re
+import time
+import heapq
+import asyncio
+from collections import deque
+from datetime import datetime
+from operator import attrgetter
+import social_models
+import truth_social_helper
+import twitter_helper
+
+# 两个平台的同文帖子发布时间相差超过这个窗口就不算转发（秒）
+CROSS_POST_WINDOW = 6 * 60 * 60
+
+# 文字不完全相同的近似重复，只有发布时间相差在这个窗口内才算转发（秒）
+NEAR_DUPLICATE_WINDOW = 30 * 60
+
+# 较短一方的词对 shingle 至少有这个比例出现在另一方：加签名、截断这类只在一侧多出词的转发接近 1，
+# 换了一个词的不同帖子（"rally in Pennsylvania" / "rally in Ohio"）两侧都有独有的词对，会低于这个值
+SHINGLE_CONTAINMENT = 0.9
+
+# 同时要求 Jaccard 相似度不低于这个值，避免一条短帖子只因为被长帖子包含就被折叠
+SHINGLE_SIMILARITY = 0.5
+
+# 词数少于这个值的短帖子 shingle 太少，只按归一化文本完全相同判断
+MIN_SHINGLE_TOKENS = 5
+
+_URL_RE = re.compile(r'https?://\S+')
+_WORD_RE = re.compile(r'[^\W_]+')
+
+def text_tokens(text):
+    """归一化文本：去掉链接（t.co 和 truthsocial 的短链接不同），小写，只保留词"""
+    return _WORD_RE.findall(_URL_RE.sub(' ', text.lower()))
+
+def shingle_hashes(tokens):
+    """相邻词对的哈希集合（只在本进程内比较，直接用内置 hash）
+    短帖子用 simhash 这类固定长度指纹误差太大，帖子数量也少，直接算集合的 Jaccard 更准"""
+    return frozenset(hash((a, b)) for a, b in zip(tokens, tokens[1:]))
+
+def is_near_duplicate(shingles, other_shingles):
+    """两个 shingle 集合是否近似重复：较短一方几乎完全被包含，且整体 Jaccard 相似度达到阈值"""
+    overlap = len(shingles & other_shingles)
+    if not overlap:
+        return False
+    if overlap / min(len(shingles), len(other_shingles)) < SHINGLE_CONTAINMENT:
+        return False
+    return overlap / (len(shingles) + len(other_shingles) - overlap) >= SHINGLE_SIMILARITY
+
+def post_timestamp(post):
+    """ISO 8601 -> epoch 秒，无法解析时返回 None"""
+    try:
+        return datetime.fromisoformat(post.created_at.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+def merge_timelines(feeds):
+    """把多个平台的帖子 k 路归并成一条按时间倒序的时间线
+    created_at 已统一为 ISO 8601 UTC，字符串比较即时间比较；各平台先各自排好序（置顶帖可能乱序）"""
+    by_time = attrgetter('created_at')
+    return list(heapq.merge(*(sorted(feed, key=by_time, reverse=True) for feed in feeds), key=by_time, reverse=True))
+
+def collapse_cross_posts(timeline):
+    """折叠不同平台之间的转发，保留最早发布的那条：文字完全相同（CROSS_POST_WINDOW 内）
+    或近似重复（NEAR_DUPLICATE_WINDOW 内）；同一平台的帖子之间从不折叠
+    返回 (折叠后的时间线, 被折叠的帖子 [{id, platform, url, duplicate_of}])"""
+    kept = []
+    cross_posts = []
+    # 从旧到新扫描，窗口里只保留最近 CROSS_POST_WINDOW 秒内保留下来的帖子
+    window = deque()
+    
+    for post in reversed(timeline):
+        timestamp = post_timestamp(post)
+        tokens = text_tokens(post.text)
+        if timestamp is None or not tokens:
+            kept.append(post)
+            continue
+        
+        while window and timestamp - window[0][0] > CROSS_POST_WINDOW:
+            window.popleft()
+        
+        exact = hash(tuple(tokens))
+        shingles = shingle_hashes(tokens) if len(tokens) >= MIN_SHINGLE_TOKENS else None
+        
+        original = None
+        for other_timestamp, other_exact, other_shingles, other in window:
+            if other.platform == post.platform:
+                continue
+            if exact == other_exact or (
+                shingles is not None and other_shingles is not None
+                and timestamp - other_timestamp <= NEAR_DUPLICATE_WINDOW
+                and is_near_duplicate(shingles, other_shingles)
+            ):
+                original = other
+                break
+        
+        if original is not None:
+            cross_posts.append({'id': post.id, 'platform': post.platform, 'url': post.url, 'duplicate_of': original.id})
+            continue
+        
+        kept.append(post)
+        window.append((timestamp, exact, shingles, post))
+    
+    kept.reverse()
+    return kept, cross_posts
+
+async def timed(coro, start):
+    """返回 (结果, 从 start 到拿到结果的毫秒数)
+    从整个请求开始计时，一个平台被另一个平台阻塞事件循环的时间也算在内"""
+    result = await coro
+    return result, round((time.perf_counter() - start) * 1000, 2)
+
+async def get_person_feed_async(twitter_handle, truthsocial_handle, limit=20):
+    """并发抓取两个平台并合并成一条时间线；一个平台失败时仍返回另一个平台的帖子"""
+    start = time.perf_counter()
+    
+    (twitter_result, twitter_ms), (truthsocial_result, truthsocial_ms) = await asyncio.gather(
+        timed(twitter_helper.get_user_tweets_async(twitter_handle, limit), start),
+        timed(truth_social_helper.get_posts_async(truthsocial_handle, limit), start),
+    )
+    
+    sources = {}
+    feeds = []
+    errors = []
+    for platform, result, elapsed_ms in (
+        (social_models.TWITTER, twitter_result, twitter_ms),
+        (social_models.TRUTHSOCIAL, truthsocial_result, truthsocial_ms),
+    ):
+        sources[platform] = {'success': result['success'], 'count': result.get('count', 0), 'elapsed_ms': elapsed_ms}
+        if result['success']:
+            feeds.append(result['posts'])
+        else:
+            sources[platform]['error'] = result['error']
+            errors.append(f"{platform}: {result['error']}")
+    
+    if not feeds:
+        return {'success': False, 'error': '; '.join(errors), 'sources': sources}
+    
+    timeline, cross_posts = collapse_cross_posts(merge_timelines(feeds))
+    
+    return social_models.posts_result(
+        timeline,
+        cross_posts=cross_posts,
+        sources=sources,
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
+
+def get_person_feed(twitter_handle, truthsocial_handle, limit=20):
+    """同步包装器"""
+    return asyncio.run(get_person_feed_async(twitter_handle, truthsocial_handle, limit))
+
+def main():
+    if len(sys.argv) < 2:
+        print(json.dumps({'success': False, 'error': 'No command specified'}))
+        sys.exit(1)
+    
+    command = sys.argv[1]
+    
+    if command == 'get_person_feed':
+        if len(sys.argv) < 4:
+            print(json.dumps({'success': False, 'error': 'Usage: person_feed_helper.py get_person_feed <twitter_handle> <truthsocial_handle> [limit]'}))
+            sys.exit(1)
+        
+        twitter_handle = sys.argv[2].lstrip('@')
+        truthsocial_handle = sys.argv[3].lstrip('@')
+        limit = int(sys.argv[4]) if len(sys.argv) > 4 else 20
+        result = get_person_feed(twitter_handle, truthsocial_handle, limit)
+    
+    else:
+        result = {'success': False, 'error': f'Unknown command: {command}'}
+    
+    social_models.dump(result, sys.stdout)
+
+if __name__ == '__main__':
+    main()
@@ -164,13 +164,10 @@ async function cacheTruthSocialPosts(handle: string) {
 async function refreshAllCaches() {
   console.log('Starting background cache refresh...');
   
-  for (const { platform, handle } of ACCOUNTS_TO_CACHE) {
-    if (platform === 'twitter') {
-      await cacheTwitterPosts(handle);
-    } else if (platform === 'truthsocial') {
-      await cacheTruthSocialPosts(handle);
-    }
-  }
+  // 各平台互不依赖，并发刷新，总耗时取决于最慢的一个平台
+  await Promise.all(ACCOUNTS_TO_CACHE.map(({ platform, handle }) =>
+    platform === 'twitter' ? cacheTwitterPosts(handle) : cacheTruthSocialPosts(handle)
+  ));
   
   console.log('Background cache refresh completed');
 }
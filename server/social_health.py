@@ -0,0 +1,122 @@
+"""
+Social Health State
+缓存各平台凭证的健康检查结果（带过期时间），所有 helper 在干活前先查一下：
+凭证已知失效时立即返回错误，而不是等 10-15 秒的请求超时
+"""
+import os
+import json
+import time
+import fcntl
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+# 状态文件路径（可通过 SOCIAL_HEALTH_FILE 覆盖）
+STATE_FILE = Path(os.environ.get('SOCIAL_HEALTH_FILE') or Path(__file__).parent / '.social_health.json')
+
+# 健康结果缓存 10 分钟；失败结果缓存 5 分钟，之后允许重新探测
+HEALTHY_TTL = 10 * 60
+UNHEALTHY_TTL = 5 * 60
+
+def fingerprint(secret):
+    """凭证指纹，凭证更换后旧的缓存结果自动失效（不在状态文件里保存明文）"""
+    return hashlib.sha256((secret or '').encode('utf-8')).hexdigest()[:16]
+
+def load_state():
+    """读取状态文件，不存在或损坏时返回空状态"""
+    try:
+        return json.loads(STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state):
+    """原子写入状态文件，避免并发的 helper 读到半个文件；写不进去时放弃（缓存只是优化）"""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=STATE_FILE.parent, prefix='.social_health.', suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, STATE_FILE)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+@contextmanager
+def locked_state():
+    """在文件锁内读写状态，并发的 helper 不会互相覆盖对方的修改；yield 是否拿到了锁
+    和 save_state 一样失败不抛异常：锁文件打不开（目录只读、磁盘满）时不加锁继续，
+    调用方往往就在 except 分支里，健康缓存写不进去不能变成新的错误"""
+    try:
+        lock = open(STATE_FILE.with_name(STATE_FILE.name + '.lock'), 'a')
+    except OSError:
+        yield False
+        return
+
+    with lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+def _key(platform, secret):
+    return f'{platform}:{fingerprint(secret)}'
+
+def get_status(platform, secret):
+    """返回未过期的缓存结果，没有或已过期时返回 None"""
+    entry = load_state().get(_key(platform, secret))
+    if not entry or entry.get('expires_at', 0) <= time.time():
+        return None
+    return entry
+
+def record_status(platform, secret, healthy, error=None, **extra):
+    """记录一次健康检查结果"""
+    now = time.time()
+    entry = {
+        'platform': platform,
+        'healthy': healthy,
+        'checked_at': now,
+        'expires_at': now + (HEALTHY_TTL if healthy else UNHEALTHY_TTL),
+        **extra,
+    }
+    if error:
+        entry['error'] = error
+
+    with locked_state():
+        # 顺便清理过期条目，防止状态文件无限增长
+        state = {k: v for k, v in load_state().items() if v.get('expires_at', 0) > now}
+        state[_key(platform, secret)] = entry
+        save_state(state)
+    return entry
+
+def cached_failure(platform, secret):
+    """凭证已知失效时返回错误信息，否则返回 None（helper 干活前调用）"""
+    entry = get_status(platform, secret)
+    if entry and not entry['healthy']:
+        return f"{platform} credentials unhealthy (cached): {entry.get('error', 'unknown error')}"
+    return None
+
+def claim(platform, action, interval):
+    """在 interval 秒内只允许一个进程执行 action（例如后台重新登录），返回是否拿到
+    按平台而不是按凭证计，换了新凭证也不会绕过间隔；检查和写入在同一把文件锁内完成"""
+    key = f'{platform}:{action}'
+    with locked_state() as locked:
+        # 拿不到锁时无法保证只有一个进程执行，宁可这次不做
+        if not locked:
+            return False
+        state = load_state()
+        now = time.time()
+        if state.get(key, {}).get('expires_at', 0) > now:
+            return False
+        state[key] = {'platform': platform, 'action': action, 'expires_at': now + interval}
+        save_state(state)
+    return True
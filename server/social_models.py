@@ -0,0 +1,375 @@
+"""
+Social Models
+所有 helper 共用的紧凑帖子 / 用户模型（__slots__，不为每个帖子分配 __dict__），
+每个数据源一个归一化函数，所有 helper 输出同一套字段：
+
+    Post: id, platform, text, created_at (ISO 8601 UTC), url,
+          like_count, repost_count, reply_count, quote_count,
+          is_repost, is_reply, media [{type, url}], author (screen_name)
+    User: id, platform, screen_name, name, description,
+          followers_count, following_count, statuses_count,
+          verified, profile_image_url, created_at
+
+结果包装统一为 {'success': True, 'posts': [...], 'count': n} / {'success': True, 'user': {...}}
+以及 {'success': False, 'error': '...'}，用 dump() / dumps() 输出
+"""
+import re
+import json
+from html import unescape
+from datetime import datetime, timezone
+
+TRUTHSOCIAL = 'truthsocial'
+TWITTER = 'twitter'
+
+class User:
+    """紧凑的用户模型"""
+
+    __slots__ = (
+        'id', 'platform', 'screen_name', 'name', 'description',
+        'followers_count', 'following_count', 'statuses_count',
+        'verified', 'profile_image_url', 'created_at',
+    )
+
+    def __init__(self, id, platform, screen_name, name='', description='',
+                 followers_count=0, following_count=0, statuses_count=0,
+                 verified=False, profile_image_url='', created_at=''):
+        self.id = id
+        self.platform = platform
+        self.screen_name = screen_name
+        self.name = name
+        self.description = description
+        self.followers_count = followers_count
+        self.following_count = following_count
+        self.statuses_count = statuses_count
+        self.verified = verified
+        self.profile_image_url = profile_image_url
+        self.created_at = created_at
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'platform': self.platform,
+            'screen_name': self.screen_name,
+            'name': self.name,
+            'description': self.description,
+            'followers_count': self.followers_count,
+            'following_count': self.following_count,
+            'statuses_count': self.statuses_count,
+            'verified': self.verified,
+            'profile_image_url': self.profile_image_url,
+            'created_at': self.created_at,
+        }
+
+class Post:
+    """紧凑的帖子模型；同一用户的帖子共享一个 User 实例，media 为 (type, url) 元组或 None
+    Twitter 帖子先保存原始的 created_at，ISO 时间和链接在第一次读取时生成并写回槽位，
+    只归一化不输出的帖子不分配这两个字符串，之后的读取（排序、序列化）也不再重复生成"""
+
+    __slots__ = (
+        'id', 'platform', 'text', '_created_at', '_url', '_pending',
+        'like_count', 'repost_count', 'reply_count', 'quote_count',
+        'is_repost', 'is_reply', 'media', 'author',
+    )
+
+    def __init__(self, id, platform, text, created_at, url,
+                 like_count=0, repost_count=0, reply_count=0, quote_count=0,
+                 is_repost=False, is_reply=False, media=None, author=None):
+        self.id = id
+        self.platform = platform
+        self.text = text
+        self._created_at = created_at
+        self._url = url
+        self._pending = platform == TWITTER
+        self.like_count = like_count
+        self.repost_count = repost_count
+        self.reply_count = reply_count
+        self.quote_count = quote_count
+        self.is_repost = is_repost
+        self.is_reply = is_reply
+        self.media = media
+        self.author = author
+
+    def _derive(self):
+        """生成 Twitter 帖子的 ISO 时间和链接，写回槽位"""
+        self._created_at = twitter_time_to_iso(self._created_at)
+        if not self._url:
+            screen_name = self.author.screen_name if self.author else 'i/web'
+            self._url = f'https://x.com/{screen_name}/status/{self.id}'
+        self._pending = False
+
+    @property
+    def created_at(self):
+        """ISO 8601 UTC"""
+        if self._pending:
+            self._derive()
+        return self._created_at
+
+    @property
+    def url(self):
+        if self._pending:
+            self._derive()
+        return self._url
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'platform': self.platform,
+            'text': self.text,
+            'created_at': self.created_at,
+            'url': self.url,
+            'like_count': self.like_count,
+            'repost_count': self.repost_count,
+            'reply_count': self.reply_count,
+            'quote_count': self.quote_count,
+            'is_repost': self.is_repost,
+            'is_reply': self.is_reply,
+            'media': [{'type': t, 'url': u} for t, u in self.media] if self.media else [],
+            'author': self.author.screen_name if self.author else '',
+        }
+
+def posts_result(posts, **extra):
+    """帖子列表的统一结果包装（保留 Post 对象，由 dumps 序列化）"""
+    return {'success': True, 'posts': posts, 'count': len(posts), **extra}
+
+def user_result(user):
+    """用户信息的统一结果包装"""
+    return {'success': True, 'user': user}
+
+def _to_dict(obj):
+    if isinstance(obj, (Post, User)):
+        return obj.to_dict()
+    return str(obj)
+
+_encode_str = json.encoder.encode_basestring_ascii
+
+def _encode(value):
+    """单个值的 JSON，常见类型直接编码，其余交给 json.dumps（输出与 json.dumps 一致）"""
+    cls = value.__class__
+    if cls is str:
+        return _encode_str(value)
+    if cls is int:
+        return int.__repr__(value)
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    return json.dumps(value, default=_to_dict)
+
+_POST_JSON = (
+    '{"id": %s, "platform": %s, "text": %s, "created_at": %s, "url": %s, '
+    '"like_count": %s, "repost_count": %s, "reply_count": %s, "quote_count": %s, '
+    '"is_repost": %s, "is_reply": %s, "media": [%s], "author": %s}'
+)
+_MEDIA_JSON = '{"type": %s, "url": %s}'
+_JSON_BOOL = {True: 'true', False: 'false'}
+
+def _post_json(post):
+    """直接从槽位拼出一个帖子的 JSON，不经过 to_dict 的中间 dict，结果与 json.dumps(post.to_dict()) 相同
+    归一化函数产生的类型（字符串、整数、布尔）走模板；其他类型（None、浮点等）抛出异常后逐个字段编码"""
+    s = _encode_str
+    n = int.__repr__
+    try:
+        media = ', '.join([_MEDIA_JSON % (s(t), s(u)) for t, u in post.media]) if post.media else ''
+        return _POST_JSON % (
+            s(post.id), s(post.platform), s(post.text), s(post.created_at), s(post.url),
+            n(post.like_count), n(post.repost_count), n(post.reply_count), n(post.quote_count),
+            _JSON_BOOL[post.is_repost], _JSON_BOOL[post.is_reply], media,
+            s(post.author.screen_name) if post.author else '""',
+        )
+    except (TypeError, KeyError):
+        pass
+
+    e = _encode
+    media = ', '.join([_MEDIA_JSON % (e(t), e(u)) for t, u in post.media]) if post.media else ''
+    return _POST_JSON % (
+        e(post.id), e(post.platform), e(post.text), e(post.created_at), e(post.url),
+        e(post.like_count), e(post.repost_count), e(post.reply_count), e(post.quote_count),
+        e(post.is_repost), e(post.is_reply), media,
+        e(post.author.screen_name if post.author else ''),
+    )
+
+def iterdumps(result):
+    """逐段生成 helper 结果的 JSON：posts 里的帖子一个一个编码，其余字段交给 json.dumps
+    （Post / User 通过 to_dict 输出）；拼起来与 json.dumps(result, default=...) 相同"""
+    posts = result.get('posts') if isinstance(result, dict) else None
+    if not isinstance(posts, list):
+        yield json.dumps(result, default=_to_dict)
+        return
+
+    separator = '{'
+    for key, value in result.items():
+        if key != 'posts':
+            yield f'{separator}{json.dumps(key)}: {json.dumps(value, default=_to_dict)}'
+        else:
+            yield f'{separator}"posts": ['
+            post_separator = ''
+            for post in posts:
+                if isinstance(post, Post):
+                    yield post_separator + _post_json(post)
+                else:
+                    yield post_separator + json.dumps(post, default=_to_dict)
+                post_separator = ', '
+            yield ']'
+        separator = ', '
+    yield '}'
+
+def dumps(result):
+    """序列化 helper 的结果"""
+    return ''.join(iterdumps(result))
+
+def dump(result, fp):
+    """把 helper 的结果逐段写入 fp（通常是 sys.stdout）并换行，不在内存里拼出完整的 JSON"""
+    for chunk in iterdumps(result):
+        fp.write(chunk)
+    fp.write('\n')
+
+# ---------- 文本 / 时间 ----------
+
+_BREAK_RE = re.compile(r'<br\s*/?>|</p>\s*<p[^>]*>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+def strip_html(html_text):
+    """把 HTML 内容转成纯文本：段落和换行变成 \\n，去掉标签并解码实体"""
+    if not html_text:
+        return ''
+    if '<' in html_text:
+        # 大多数帖子只有一个 <p>...</p> 段落，里面没有需要换成换行的标签，跳过 _BREAK_RE
+        if not (html_text.startswith('<p>') and html_text.endswith('</p>') and html_text.count('<') == 2):
+            html_text = _BREAK_RE.sub('\n', html_text)
+        html_text = _TAG_RE.sub('', html_text)
+    if '&' in html_text:
+        html_text = unescape(html_text)
+    return html_text.strip()
+
+_MONTHS = {
+    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04', 'May': '05', 'Jun': '06',
+    'Jul': '07', 'Aug': '08', 'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12',
+}
+
+def twitter_time_to_iso(value):
+    """'Sun Oct 18 21:46:00 +0000 2026' -> '2026-10-18T21:46:00.000Z'（与 Truth Social 格式一致）"""
+    if not value:
+        return ''
+    # 快速路径：Twitter 总是返回 UTC 的定长格式，按位置切片，不需要走 strptime
+    if len(value) == 30 and value[20:25] == '+0000' and value[4:7] in _MONTHS:
+        return f'{value[26:]}-{_MONTHS[value[4:7]]}-{value[8:10]}T{value[11:19]}.000Z'
+    try:
+        parsed = datetime.strptime(value, '%a %b %d %H:%M:%S %z %Y')
+    except ValueError:
+        return value
+    return parsed.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+# ---------- Truth Social (Mastodon API) ----------
+
+def user_from_mastodon(account):
+    """Truth Social accounts/lookup 或 status['account'] -> User"""
+    return User(
+        account.get('id') or '',
+        TRUTHSOCIAL,
+        account.get('username') or account.get('acct') or '',
+        account.get('display_name') or '',
+        strip_html(account.get('note')),
+        account.get('followers_count') or 0,
+        account.get('following_count') or 0,
+        account.get('statuses_count') or 0,
+        bool(account.get('verified')),
+        account.get('avatar') or '',
+        account.get('created_at') or '',
+    )
+
+def post_from_mastodon(status, author=None):
+    """Truth Social status -> Post；转发的正文和媒体取自被转发的帖子"""
+    reblog = status.get('reblog')
+    source = reblog or status
+    media = source.get('media_attachments')
+    return Post(
+        status.get('id') or '',
+        TRUTHSOCIAL,
+        strip_html(source.get('content')),
+        status.get('created_at') or '',
+        status.get('url') or source.get('url') or '',
+        status.get('favourites_count') or 0,
+        status.get('reblogs_count') or 0,
+        status.get('replies_count') or 0,
+        0,
+        reblog is not None,
+        status.get('in_reply_to_id') is not None,
+        tuple((m.get('type') or 'image', m.get('url') or '') for m in media) if media else None,
+        author,
+    )
+
+# ---------- Twitter (GraphQL: data_api 原始响应和 twikit 共用) ----------
+
+def user_from_twitter_graphql(user_result):
+    """GraphQL user result -> User；兼容新版 core/avatar/verification 字段和旧版 legacy 字段"""
+    core = user_result.get('core') or {}
+    legacy = user_result.get('legacy') or {}
+    avatar = user_result.get('avatar') or {}
+    verification = user_result.get('verification') or {}
+    return User(
+        user_result.get('rest_id') or '',
+        TWITTER,
+        core.get('screen_name') or legacy.get('screen_name') or '',
+        core.get('name') or legacy.get('name') or '',
+        legacy.get('description') or '',
+        legacy.get('followers_count') or 0,
+        legacy.get('friends_count') or 0,
+        legacy.get('statuses_count') or 0,
+        bool(verification.get('verified') or user_result.get('is_blue_verified') or legacy.get('verified')),
+        avatar.get('image_url') or legacy.get('profile_image_url_https') or '',
+        twitter_time_to_iso(core.get('created_at') or legacy.get('created_at') or ''),
+    )
+
+def post_from_twitter_graphql(tweet_result, author=None):
+    """GraphQL tweet result -> Post；长推文取 note_tweet 的全文"""
+    if 'tweet' in tweet_result and tweet_result.get('__typename') == 'TweetWithVisibilityResults':
+        tweet_result = tweet_result['tweet']
+    legacy = tweet_result.get('legacy') or {}
+
+    text = legacy.get('full_text') or ''
+    if 'note_tweet' in tweet_result:
+        note = ((tweet_result['note_tweet'] or {}).get('note_tweet_results') or {}).get('result') or {}
+        text = note.get('text') or text
+
+    media = (legacy.get('entities') or {}).get('media')
+    # created_at 保存 Twitter 原始格式、链接留空，读取时由 Post 生成
+    return Post(
+        legacy.get('id_str') or tweet_result.get('rest_id') or '',
+        TWITTER,
+        text,
+        legacy.get('created_at') or '',
+        '',
+        legacy.get('favorite_count') or 0,
+        legacy.get('retweet_count') or 0,
+        legacy.get('reply_count') or 0,
+        legacy.get('quote_count') or 0,
+        bool(legacy.get('retweeted_status_result')),
+        bool(legacy.get('in_reply_to_status_id_str')),
+        tuple(
+            (m.get('type') or 'photo', m.get('media_url_https') or m.get('media_url') or '')
+            for m in media
+        ) if media else None,
+        author,
+    )
+
+def user_from_twikit(user):
+    """twikit User -> User（twikit 已经解析好属性）"""
+    return User(
+        user.id,
+        TWITTER,
+        user.screen_name,
+        user.name,
+        user.description or '',
+        user.followers_count,
+        user.following_count,
+        user.statuses_count,
+        bool(user.verified or user.is_blue_verified),
+        user.profile_image_url or '',
+        twitter_time_to_iso(user.created_at),
+    )
+
+def post_from_twikit(tweet, author=None):
+    """twikit Tweet -> Post；直接读 twikit 保存的 GraphQL 原始数据，跳过逐个属性访问"""
+    return post_from_twitter_graphql(tweet._data, author)
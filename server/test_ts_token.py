@@ -9,9 +9,9 @@ headers = {
 }
 
 try:
-    # 测试获取特朗普用户信息
+    # 用最便宜的 verify_credentials 端点验证 token（不再完整查询用户）
     response = requests.get(
-        "https://truthsocial.com/api/v1/accounts/lookup?acct=realDonaldTrump",
+        "https://truthsocial.com/api/v1/accounts/verify_credentials",
         headers=headers,
         impersonate="chrome110",
         timeout=15
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# helper 脚本以 server/ 为工作目录直接互相导入（import social_models）
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+import person_feed_helper
+from person_feed_helper import merge_timelines, collapse_cross_posts, CROSS_POST_WINDOW, NEAR_DUPLICATE_WINDOW
+from social_models import Post, TWITTER, TRUTHSOCIAL
+
+BASE_TIME = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+RALLY = 'Big rally tonight in Pennsylvania! Thank you to all of our great patriots. MAKE AMERICA GREAT AGAIN!'
+
+def iso(seconds):
+    return (BASE_TIME + timedelta(seconds=seconds)).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+def post(id, platform, text, seconds):
+    return Post(id, platform, text, iso(seconds), f'https://example.com/{id}')
+
+def ids(posts):
+    return [p.id for p in posts]
+
+def test_merge_orders_across_platforms_newest_first():
+    twitter = [post('t1', TWITTER, 'a', 300), post('t2', TWITTER, 'b', 100)]
+    truthsocial = [post('s1', TRUTHSOCIAL, 'c', 400), post('s2', TRUTHSOCIAL, 'd', 200), post('s3', TRUTHSOCIAL, 'e', 0)]
+
+    assert ids(merge_timelines([twitter, truthsocial])) == ['s1', 't1', 's2', 't2', 's3']
+
+def test_merge_sorts_out_of_order_feeds():
+    # 置顶帖排在最前但时间更早
+    twitter = [post('pinned', TWITTER, 'a', 0), post('t1', TWITTER, 'b', 300)]
+    truthsocial = [post('s1', TRUTHSOCIAL, 'c', 200)]
+
+    assert ids(merge_timelines([twitter, truthsocial])) == ['t1', 's1', 'pinned']
+
+def test_merge_compares_twitter_and_truthsocial_timestamps():
+    twitter = [Post('t1', TWITTER, 'a', 'Sun Oct 18 12:05:00 +0000 2026', '')]
+    truthsocial = [post('s1', TRUTHSOCIAL, 'b', 600), post('s2', TRUTHSOCIAL, 'c', 0)]
+
+    assert ids(merge_timelines([twitter, truthsocial])) == ['s1', 't1', 's2']
+
+def test_exact_cross_post_keeps_earliest():
+    timeline = merge_timelines([
+        [post('t1', TWITTER, RALLY + ' https://t.co/abc', 120)],
+        [post('s1', TRUTHSOCIAL, RALLY, 0)],
+    ])
+
+    kept, cross_posts = collapse_cross_posts(timeline)
+
+    assert ids(kept) == ['s1']
+    assert cross_posts == [{'id': 't1', 'platform': TWITTER, 'url': 'https://example.com/t1', 'duplicate_of': 's1'}]
+
+def test_near_duplicate_with_signature_is_collapsed():
+    timeline = merge_timelines([
+        [post('t1', TWITTER, RALLY, 600)],
+        [post('s1', TRUTHSOCIAL, RALLY + '\nPresident DJT', 0)],
+    ])
+
+    kept, cross_posts = collapse_cross_posts(timeline)
+
+    assert ids(kept) == ['s1']
+    assert cross_posts[0]['duplicate_of'] == 's1'
+
+def test_posts_differing_in_one_word_are_not_collapsed():
+    timeline = merge_timelines([
+        [post('t1', TWITTER, RALLY.replace('Pennsylvania', 'Ohio'), 240)],
+        [post('s1', TRUTHSOCIAL, RALLY, 0)],
+    ])
+
+    kept, cross_posts = collapse_cross_posts(timeline)
+
+    assert ids(kept) == ['t1', 's1']
+    assert cross_posts == []
+
+def test_same_platform_is_never_collapsed():
+    timeline = merge_timelines([[post('s2', TRUTHSOCIAL, RALLY, 60), post('s1', TRUTHSOCIAL, RALLY, 0)]])
+
+    kept, cross_posts = collapse_cross_posts(timeline)
+
+    assert ids(kept) == ['s2', 's1']
+    assert cross_posts == []
+
+def test_unparseable_created_at_is_kept_and_never_collapsed():
+    broken = Post('s1', TRUTHSOCIAL, RALLY, 'yesterday', '')
+    empty = Post('s2', TRUTHSOCIAL, RALLY, '', '')
+    timeline = merge_timelines([[post('t1', TWITTER, RALLY, 0)], [broken, empty]])
+
+    kept, cross_posts = collapse_cross_posts(timeline)
+
+    assert sorted(ids(kept)) == ['s1', 's2', 't1']
+    assert cross_posts == []
+
+def test_exact_match_window_edge():
+    inside = merge_timelines([[post('t1', TWITTER, RALLY, CROSS_POST_WINDOW)], [post('s1', TRUTHSOCIAL, RALLY, 0)]])
+    outside = merge_timelines([[post('t1', TWITTER, RALLY, CROSS_POST_WINDOW + 1)], [post('s1', TRUTHSOCIAL, RALLY, 0)]])
+
+    assert ids(collapse_cross_posts(inside)[0]) == ['s1']
+    assert ids(collapse_cross_posts(outside)[0]) == ['t1', 's1']
+
+def test_near_duplicate_window_edge():
+    signed = RALLY + '\nPresident DJT'
+    inside = merge_timelines([[post('t1', TWITTER, RALLY, NEAR_DUPLICATE_WINDOW)], [post('s1', TRUTHSOCIAL, signed, 0)]])
+    outside = merge_timelines([[post('t1', TWITTER, RALLY, NEAR_DUPLICATE_WINDOW + 1)], [post('s1', TRUTHSOCIAL, signed, 0)]])
+
+    assert ids(collapse_cross_posts(inside)[0]) == ['s1']
+    assert ids(collapse_cross_posts(outside)[0]) == ['t1', 's1']
+
+def test_short_posts_only_collapse_on_exact_match():
+    exact = merge_timelines([[post('t1', TWITTER, 'MAKE AMERICA GREAT AGAIN!', 60)], [post('s1', TRUTHSOCIAL, 'Make America Great Again', 0)]])
+    different = merge_timelines([[post('t1', TWITTER, 'MAKE AMERICA GREAT AGAIN!', 60)], [post('s1', TRUTHSOCIAL, 'MAKE AMERICA WEALTHY AGAIN!', 0)]])
+
+    assert ids(collapse_cross_posts(exact)[0]) == ['s1']
+    assert ids(collapse_cross_posts(different)[0]) == ['t1', 's1']
+
+def test_media_only_posts_are_kept():
+    timeline = merge_timelines([[post('t1', TWITTER, 'https://t.co/abc', 60)], [post('s1', TRUTHSOCIAL, '', 0)]])
+
+    assert ids(collapse_cross_posts(timeline)[0]) == ['t1', 's1']
+
+def test_text_tokens_drops_links_and_punctuation():
+    assert person_feed_helper.text_tokens('Drill, baby, DRILL! https://t.co/x') == ['drill', 'baby', 'drill']
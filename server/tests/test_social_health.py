@@ -0,0 +1,140 @@
+import json
+import time
+import asyncio
+
+import pytest
+from twikit.errors import Unauthorized
+
+import social_health
+import twitter_helper
+
+@pytest.fixture(autouse=True)
+def state_file(tmp_path, monkeypatch):
+    path = tmp_path / 'health.json'
+    monkeypatch.setattr(social_health, 'STATE_FILE', path)
+    return path
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可拨动的 time.time"""
+    now = [1_800_000_000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    return now
+
+@pytest.fixture
+def cookies(tmp_path, monkeypatch):
+    path = tmp_path / 'cookies.json'
+    path.write_text(json.dumps({'auth_token': 'session-1'}))
+    monkeypatch.setattr(twitter_helper, 'COOKIES_FILE', path)
+    return path
+
+def test_unhealthy_entry_expires(clock):
+    social_health.record_status('truthsocial', 'token', False, error='HTTP 401')
+
+    assert social_health.cached_failure('truthsocial', 'token') == 'truthsocial credentials unhealthy (cached): HTTP 401'
+
+    clock[0] += social_health.UNHEALTHY_TTL - 1
+    assert social_health.cached_failure('truthsocial', 'token') is not None
+
+    clock[0] += 1
+    assert social_health.get_status('truthsocial', 'token') is None
+    assert social_health.cached_failure('truthsocial', 'token') is None
+
+def test_healthy_entry_expires(clock):
+    social_health.record_status('truthsocial', 'token', True, account='a')
+
+    clock[0] += social_health.HEALTHY_TTL - 1
+    assert social_health.get_status('truthsocial', 'token')['account'] == 'a'
+
+    clock[0] += 1
+    assert social_health.get_status('truthsocial', 'token') is None
+
+def test_expired_entries_are_pruned_on_write(clock, state_file):
+    social_health.record_status('truthsocial', 'old', False, error='x')
+    clock[0] += social_health.UNHEALTHY_TTL
+    social_health.record_status('truthsocial', 'new', True)
+
+    assert list(json.loads(state_file.read_text())) == [f"truthsocial:{social_health.fingerprint('new')}"]
+
+def test_rotated_token_ignores_cached_failure(state_file):
+    social_health.record_status('truthsocial', 'old-token', False, error='HTTP 401')
+
+    assert social_health.cached_failure('truthsocial', 'new-token') is None
+    assert social_health.cached_failure('twitter', 'old-token') is None
+    assert 'old-token' not in state_file.read_text()
+
+def test_claim_only_once_per_interval(clock):
+    assert social_health.claim('twitter', 'relogin', 300) is True
+    assert social_health.claim('twitter', 'relogin', 300) is False
+    assert social_health.claim('truthsocial', 'relogin', 300) is True
+
+    clock[0] += 299
+    assert social_health.claim('twitter', 'relogin', 300) is False
+
+    clock[0] += 1
+    assert social_health.claim('twitter', 'relogin', 300) is True
+
+def test_unwritable_state_fails_open(tmp_path, monkeypatch):
+    monkeypatch.setattr(social_health, 'STATE_FILE', tmp_path / 'missing' / 'health.json')
+
+    entry = social_health.record_status('twitter', 'session', False, error='x')
+
+    assert entry['healthy'] is False
+    assert social_health.get_status('twitter', 'session') is None
+    # 拿不到锁时不允许后台重新登录
+    assert social_health.claim('twitter', 'relogin', 300) is False
+
+def test_record_session_failure_survives_unwritable_state(tmp_path, monkeypatch, cookies):
+    monkeypatch.setattr(social_health, 'STATE_FILE', tmp_path / 'missing' / 'health.json')
+    monkeypatch.setenv('TWITTER_EMAIL', 'a@example.com')
+    monkeypatch.setenv('TWITTER_PASSWORD', 'x')
+
+    twitter_helper.record_session_failure('401 Unauthorized')
+
+class UnauthorizedV11:
+    async def settings(self):
+        raise Unauthorized('401 Unauthorized')
+
+class UnauthorizedClient:
+    v11 = UnauthorizedV11()
+
+def unauthorized_client(monkeypatch):
+    async def init_client(fresh_login=False):
+        return UnauthorizedClient()
+    monkeypatch.setattr(twitter_helper, 'init_client', init_client)
+
+    relogins = []
+    monkeypatch.setattr(twitter_helper, 'start_background_relogin', lambda: relogins.append(True))
+    return relogins
+
+def test_health_without_relogin_does_not_start_relogin(monkeypatch, cookies):
+    relogins = unauthorized_client(monkeypatch)
+
+    result = asyncio.run(twitter_helper.health_async(force=True, relogin=False))
+
+    assert result['success'] is False
+    assert result['healthy'] is False
+    assert relogins == []
+    assert social_health.cached_failure('twitter', 'session-1') is not None
+
+def test_health_failure_starts_relogin(monkeypatch, cookies):
+    relogins = unauthorized_client(monkeypatch)
+
+    asyncio.run(twitter_helper.health_async(force=True))
+
+    assert relogins == [True]
+
+def test_main_fails_fast_on_cached_failure(monkeypatch, capsys, cookies):
+    social_health.record_status('twitter', 'session-1', False, error='401 Unauthorized')
+
+    async def init_client(fresh_login=False):
+        raise AssertionError('should not connect')
+    monkeypatch.setattr(twitter_helper, 'init_client', init_client)
+    monkeypatch.setattr('sys.argv', ['twitter_helper.py', 'get_tweets', 'realDonaldTrump'])
+
+    twitter_helper.main()
+
+    assert json.loads(capsys.readouterr().out) == {
+        'success': False,
+        'error': 'twitter credentials unhealthy (cached): 401 Unauthorized',
+    }
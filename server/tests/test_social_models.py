@@ -0,0 +1,129 @@
+import json
+
+import social_models
+from social_models import Post, User, TWITTER, TRUTHSOCIAL
+
+def round_trip(post):
+    """dumps 的输出解析回来应当和 to_dict 完全一致"""
+    return json.loads(social_models.dumps(social_models.posts_result([post])))['posts'][0]
+
+def test_mastodon_status_with_null_fields():
+    post = social_models.post_from_mastodon({
+        'id': '1',
+        'content': None,
+        'created_at': None,
+        'url': None,
+        'favourites_count': None,
+        'reblogs_count': None,
+        'replies_count': None,
+        'media_attachments': [{'type': None, 'url': 'https://example.com/a.jpg'}, {'type': 'video', 'url': None}],
+    })
+
+    assert post.to_dict() == round_trip(post)
+    assert post.text == ''
+    assert post.like_count == 0
+    assert post.to_dict()['media'] == [
+        {'type': 'image', 'url': 'https://example.com/a.jpg'},
+        {'type': 'video', 'url': ''},
+    ]
+
+def test_twitter_graphql_with_null_fields():
+    post = social_models.post_from_twitter_graphql({
+        'rest_id': '9',
+        'note_tweet': None,
+        'legacy': {
+            'created_at': 'Sun Oct 18 21:46:00 +0000 2026',
+            'full_text': None,
+            'favorite_count': None,
+            'entities': {'media': [{'type': None, 'media_url_https': None, 'media_url': None}]},
+        },
+    })
+
+    assert post.to_dict() == round_trip(post)
+    assert post.text == ''
+    assert post.to_dict()['media'] == [{'type': 'photo', 'url': ''}]
+
+def test_twitter_created_at_and_url_are_derived():
+    author = User('25073877', TWITTER, 'realDonaldTrump')
+    post = social_models.post_from_twitter_graphql({
+        'legacy': {'id_str': '42', 'created_at': 'Sun Oct 18 21:46:00 +0000 2026', 'full_text': 'hi'},
+    }, author)
+
+    assert post.created_at == '2026-10-18T21:46:00.000Z'
+    assert post.url == 'https://x.com/realDonaldTrump/status/42'
+    assert round_trip(post)['created_at'] == '2026-10-18T21:46:00.000Z'
+    assert round_trip(post)['author'] == 'realDonaldTrump'
+
+def test_twitter_visibility_wrapper_and_note_tweet():
+    post = social_models.post_from_twitter_graphql({
+        '__typename': 'TweetWithVisibilityResults',
+        'tweet': {
+            'rest_id': '7',
+            'note_tweet': {'note_tweet_results': {'result': {'text': 'the full long text'}}},
+            'legacy': {'id_str': '7', 'created_at': '', 'full_text': 'the full…'},
+        },
+    })
+
+    assert post.id == '7'
+    assert post.text == 'the full long text'
+    assert post.url == 'https://x.com/i/web/status/7'
+
+def test_twitter_time_to_iso():
+    assert social_models.twitter_time_to_iso('Sun Oct 18 21:46:00 +0000 2026') == '2026-10-18T21:46:00.000Z'
+    assert social_models.twitter_time_to_iso('Sun Oct 18 23:46:00 +0200 2026') == '2026-10-18T21:46:00.000Z'
+    assert social_models.twitter_time_to_iso('not a date') == 'not a date'
+    assert social_models.twitter_time_to_iso('') == ''
+
+def test_strip_html():
+    assert social_models.strip_html('<p>Hello &amp; welcome</p><p>President DJT</p>') == 'Hello & welcome\nPresident DJT'
+    assert social_models.strip_html('line<br/>break') == 'line\nbreak'
+    assert social_models.strip_html(None) == ''
+
+def test_truthsocial_post_keeps_its_own_url_and_time():
+    post = Post('1', TRUTHSOCIAL, 'text', '2026-10-18T21:42:00.330Z', 'https://truthsocial.com/@a/1')
+
+    assert post.created_at == '2026-10-18T21:42:00.330Z'
+    assert post.url == 'https://truthsocial.com/@a/1'
+
+def test_dumps_user_and_error_results():
+    user = User('1', TRUTHSOCIAL, 'realDonaldTrump', followers_count=None)
+
+    assert json.loads(social_models.dumps(social_models.user_result(user))) == {'success': True, 'user': user.to_dict()}
+    assert json.loads(social_models.dumps({'success': False, 'error': 'x'})) == {'success': False, 'error': 'x'}
+    assert json.loads(social_models.dumps(social_models.posts_result([]))) == {'success': True, 'posts': [], 'count': 0}
+
+def test_dumps_matches_json_dumps_of_to_dict():
+    author = User('25073877', TWITTER, 'realDonaldTrump')
+    posts = [
+        Post('1', TRUTHSOCIAL, 'café "quoted"\n', '2026-10-18T21:42:00.330Z', 'https://truthsocial.com/@a/1',
+             1, 2, 3, 0, True, False, (('image', 'https://example.com/a.jpg'), ('video', '')), author),
+        Post('2', TWITTER, 'hi', 'Sun Oct 18 21:46:00 +0000 2026', '', author=author),
+        # 非常规类型走逐字段编码
+        Post(3, TWITTER, None, None, None, None, 2.5, 0, 0, None, 1, ((None, None),)),
+    ]
+    result = social_models.posts_result(posts, cross_posts=[{'id': 'x'}], sources={'twitter': {'success': True}})
+    expected = json.dumps({**result, 'posts': [post.to_dict() for post in posts]})
+
+    assert social_models.dumps(result) == expected
+
+def test_dump_writes_json_line(capsys):
+    import sys
+
+    social_models.dump(social_models.posts_result([Post('1', TRUTHSOCIAL, 'a', '', '')]), sys.stdout)
+
+    out = capsys.readouterr().out
+    assert out.endswith('}\n')
+    assert json.loads(out)['posts'][0]['id'] == '1'
+
+def test_twitter_created_at_and_url_are_derived_once(monkeypatch):
+    calls = []
+    original = social_models.twitter_time_to_iso
+    monkeypatch.setattr(social_models, 'twitter_time_to_iso', lambda value: calls.append(value) or original(value))
+    post = Post('42', TWITTER, 'hi', 'Sun Oct 18 21:46:00 +0000 2026', '')
+
+    assert post.url == 'https://x.com/i/web/status/42'
+    assert post.created_at == '2026-10-18T21:46:00.000Z'
+    assert post.created_at == '2026-10-18T21:46:00.000Z'
+    social_models.dumps(social_models.posts_result([post]))
+
+    assert calls == ['Sun Oct 18 21:46:00 +0000 2026']
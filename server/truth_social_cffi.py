@@ -2,14 +2,21 @@ import sys
 import json
 import os
 from curl_cffi import requests
+import social_health
+import social_models
 
 # Truth Social API 配置
 ACCESS_TOKEN = os.getenv('TRUTHSOCIAL_ACCESS_TOKEN', '')
-BASE_URL = 'https://truthsocial.com/api/v1'
+BASE_URL = os.getenv('TRUTHSOCIAL_BASE_URL', 'https://truthsocial.com').rstrip('/') + '/api/v1'
 
 def get_posts(handle, limit=20):
     """获取用户的 Truth Social 帖子"""
     try:
+        # token 已知失效时直接返回，不等请求超时
+        cached_error = social_health.cached_failure('truthsocial', ACCESS_TOKEN)
+        if cached_error:
+            return {'success': False, 'error': cached_error}
+        
         # 查找用户 ID
         search_url = f"{BASE_URL}/accounts/lookup?acct={handle}"
         headers = {
@@ -20,64 +27,52 @@ def get_posts(handle, limit=20):
         # 使用 curl-cffi 模拟真实浏览器
         response = requests.get(search_url, headers=headers, impersonate="chrome110")
         
+        if response.status_code == 401:
+            social_health.record_status('truthsocial', ACCESS_TOKEN, False, error='HTTP 401 from accounts/lookup')
+        
         if response.status_code != 200:
-            print(json.dumps({'error': f'Failed to lookup user: {response.status_code}'}), file=sys.stderr)
-            return []
+            return {'success': False, 'error': f'Failed to lookup user: {response.status_code}'}
         
         user_data = response.json()
         user_id = user_data.get('id')
         
         if not user_id:
-            print(json.dumps({'error': 'User ID not found'}), file=sys.stderr)
-            return []
+            return {'success': False, 'error': 'User ID not found'}
         
         # 获取用户帖子
         statuses_url = f"{BASE_URL}/accounts/{user_id}/statuses?limit={limit}"
         response = requests.get(statuses_url, headers=headers, impersonate="chrome110")
         
         if response.status_code != 200:
-            print(json.dumps({'error': f'Failed to get statuses: {response.status_code}'}), file=sys.stderr)
-            return []
-        
-        posts = response.json()
+            return {'success': False, 'error': f'Failed to get statuses: {response.status_code}'}
         
-        # 转换为标准格式
-        result = []
-        for post in posts:
-            result.append({
-                'id': post.get('id', ''),
-                'text': post.get('content', '').replace('<p>', '').replace('</p>', '').replace('<br />', '\n'),
-                'created_at': post.get('created_at', ''),
-                'favourites_count': post.get('favourites_count', 0),
-                'reblogs_count': post.get('reblogs_count', 0),
-                'replies_count': post.get('replies_count', 0),
-                'url': post.get('url', ''),
-            })
+        # 转换为统一格式
+        author = social_models.user_from_mastodon(user_data)
+        posts = [social_models.post_from_mastodon(status, author) for status in response.json()]
         
-        return result
+        return social_models.posts_result(posts)
     except Exception as e:
-        print(json.dumps({'error': str(e)}), file=sys.stderr)
-        return []
+        return {'success': False, 'error': str(e)}
 
 def main():
     if len(sys.argv) < 2:
-        print(json.dumps({'error': 'Missing command'}), file=sys.stderr)
+        print(json.dumps({'success': False, 'error': 'Missing command'}), file=sys.stderr)
         sys.exit(1)
     
     command = sys.argv[1]
     
     if command == 'get_posts':
         if len(sys.argv) < 3:
-            print(json.dumps({'error': 'Missing handle'}), file=sys.stderr)
+            print(json.dumps({'success': False, 'error': 'Missing handle'}), file=sys.stderr)
             sys.exit(1)
         
         handle = sys.argv[2]
         limit = int(sys.argv[3]) if len(sys.argv) > 3 else 20
         
-        posts = get_posts(handle, limit)
-        print(json.dumps(posts))
+        result = get_posts(handle, limit)
+        social_models.dump(result, sys.stdout)
     else:
-        print(json.dumps({'error': f'Unknown command: {command}'}), file=sys.stderr)
+        print(json.dumps({'success': False, 'error': f'Unknown command: {command}'}), file=sys.stderr)
         sys.exit(1)
 
 if __name__ == '__main__':
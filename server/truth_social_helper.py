@@ -6,10 +6,13 @@ Truth Social Helper Script
 import sys
 import json
 import os
+import asyncio
 from curl_cffi import requests
+import social_health
+import social_models
 
-# Truth Social API 基础 URL
-BASE_URL = "https://truthsocial.com/api/v1"
+# Truth Social API 基础 URL（可通过 TRUTHSOCIAL_BASE_URL 指向本地替身服务器）
+BASE_URL = os.environ.get('TRUTHSOCIAL_BASE_URL', 'https://truthsocial.com').rstrip('/') + "/api/v1"
 
 def get_headers(access_token):
     """构建请求头"""
@@ -22,63 +25,54 @@ def get_headers(access_token):
         "Origin": "https://truthsocial.com",
     }
 
-def get_posts(username, limit=20):
-    """获取用户的帖子"""
+async def get_posts_async(username, limit=20):
+    """获取用户的帖子（curl_cffi 异步会话，可以和其他平台的请求在同一个事件循环里并发）"""
     try:
         access_token = os.environ.get('TRUTHSOCIAL_ACCESS_TOKEN')
         
         if not access_token:
             return {'success': False, 'error': 'TRUTHSOCIAL_ACCESS_TOKEN not set'}
         
-        # 首先查找用户 ID
-        lookup_url = f"{BASE_URL}/accounts/lookup"
-        params = {"acct": username}
-        headers = get_headers(access_token)
-        
-        # 使用 curl_cffi 发送请求（绕过 Cloudflare）
-        response = requests.get(
-            lookup_url,
-            params=params,
-            headers=headers,
-            impersonate="chrome110",
-            timeout=10
-        )
-        
-        if response.status_code != 200:
-            return {'success': False, 'error': f'Failed to lookup user: {response.status_code}'}
-        
-        user_data = response.json()
-        user_id = user_data.get('id')
-        
-        if not user_id:
-            return {'success': False, 'error': 'User ID not found'}
-        
-        # 获取用户的帖子
-        statuses_url = f"{BASE_URL}/accounts/{user_id}/statuses"
-        params = {"limit": limit}
-        
-        response = requests.get(
-            statuses_url,
-            params=params,
-            headers=headers,
-            impersonate="chrome110",
-            timeout=10
-        )
+        # token 已知失效时直接返回，不等请求超时
+        cached_error = social_health.cached_failure('truthsocial', access_token)
+        if cached_error:
+            return {'success': False, 'error': cached_error}
+        
+        # 使用 curl_cffi 发送请求（绕过 Cloudflare），两个请求复用同一个连接
+        async with requests.AsyncSession(headers=get_headers(access_token), impersonate="chrome110", timeout=10) as session:
+            # 首先查找用户 ID
+            response = await session.get(f"{BASE_URL}/accounts/lookup", params={"acct": username})
+            
+            if response.status_code == 401:
+                social_health.record_status('truthsocial', access_token, False, error='HTTP 401 from accounts/lookup')
+            
+            if response.status_code != 200:
+                return {'success': False, 'error': f'Failed to lookup user: {response.status_code}'}
+            
+            user_data = response.json()
+            user_id = user_data.get('id')
+            
+            if not user_id:
+                return {'success': False, 'error': 'User ID not found'}
+            
+            # 获取用户的帖子
+            response = await session.get(f"{BASE_URL}/accounts/{user_id}/statuses", params={"limit": limit})
         
         if response.status_code != 200:
             return {'success': False, 'error': f'Failed to fetch posts: {response.status_code}'}
         
-        posts = response.json()
+        author = social_models.user_from_mastodon(user_data)
+        posts = [social_models.post_from_mastodon(status, author) for status in response.json()]
         
-        return {
-            'success': True,
-            'posts': posts,
-            'count': len(posts)
-        }
+        return social_models.posts_result(posts)
         
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
+def get_posts(username, limit=20):
+    """同步包装器"""
+    return asyncio.run(get_posts_async(username, limit))
+
 def get_user_info(username):
     """获取用户信息"""
     try:
@@ -87,6 +81,11 @@ def get_user_info(username):
         if not access_token:
             return {'success': False, 'error': 'TRUTHSOCIAL_ACCESS_TOKEN not set'}
         
+        # token 已知失效时直接返回，不等请求超时
+        cached_error = social_health.cached_failure('truthsocial', access_token)
+        if cached_error:
+            return {'success': False, 'error': cached_error}
+        
         lookup_url = f"{BASE_URL}/accounts/lookup"
         params = {"acct": username}
         headers = get_headers(access_token)
@@ -100,19 +99,59 @@ def get_user_info(username):
             timeout=10
         )
         
+        if response.status_code == 401:
+            social_health.record_status('truthsocial', access_token, False, error='HTTP 401 from accounts/lookup')
+        
         if response.status_code != 200:
             return {'success': False, 'error': f'Failed to lookup user: {response.status_code}'}
         
         user_info = response.json()
         
-        return {
-            'success': True,
-            'user': user_info
-        }
+        return social_models.user_result(social_models.user_from_mastodon(user_info))
         
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
+def health(force=False):
+    """用最便宜的 verify_credentials 端点检查 token，结果带过期时间缓存到状态文件"""
+    access_token = os.environ.get('TRUTHSOCIAL_ACCESS_TOKEN')
+    
+    if not access_token:
+        return {'success': False, 'healthy': False, 'error': 'TRUTHSOCIAL_ACCESS_TOKEN not set'}
+    
+    if not force:
+        cached = social_health.get_status('truthsocial', access_token)
+        if cached:
+            return {'success': cached['healthy'], 'cached': True, **cached}
+    
+    try:
+        response = requests.get(
+            f"{BASE_URL}/accounts/verify_credentials",
+            headers=get_headers(access_token),
+            impersonate="chrome110",
+            timeout=10
+        )
+    except Exception as e:
+        # 网络错误不能说明 token 失效，不写入缓存
+        return {'success': False, 'healthy': False, 'cached': False, 'error': str(e)}
+    
+    if response.status_code == 200:
+        entry = social_health.record_status(
+            'truthsocial', access_token, True,
+            account=response.json().get('username', '')
+        )
+    elif response.status_code == 401:
+        # 只有 401 说明 token 本身失效；403 可能是 Cloudflare 拦截或限流，和其他状态码一样不写缓存
+        entry = social_health.record_status(
+            'truthsocial', access_token, False,
+            error=f'HTTP {response.status_code} from accounts/verify_credentials'
+        )
+    else:
+        return {'success': False, 'healthy': False, 'cached': False,
+                'error': f'Health check failed: {response.status_code}'}
+    
+    return {'success': entry['healthy'], 'cached': False, **entry}
+
 def main():
     if len(sys.argv) < 2:
         print(json.dumps({'success': False, 'error': 'No command specified'}))
@@ -137,10 +176,13 @@ def main():
         username = sys.argv[2]
         result = get_user_info(username)
         
+    elif command == 'health':
+        result = health(force='--force' in sys.argv[2:])
+        
     else:
         result = {'success': False, 'error': f'Unknown command: {command}'}
     
-    print(json.dumps(result))
+    social_models.dump(result, sys.stdout)
 
 if __name__ == '__main__':
     main()
@@ -7,24 +7,19 @@ Truth Social API Helper - 使用 truthbrush 获取 Truth Social 帖子
 import sys
 import json
 import os
-from html import unescape
-import re
+import social_health
+import social_models
 
 try:
     from truthbrush import Api
+    import truthbrush.api as truthbrush_api
 except ImportError:
-    print(json.dumps({'error': 'truthbrush not installed. Run: pip install truthbrush'}))
+    print(json.dumps({'success': False, 'error': 'truthbrush not installed. Run: pip install truthbrush'}))
     sys.exit(1)
 
-def strip_html(html_text):
-    """移除 HTML 标签"""
-    if not html_text:
-        return ''
-    # 移除 HTML 标签
-    text = re.sub(r'<[^>]+>', '', html_text)
-    # 解码 HTML 实体
-    text = unescape(text)
-    return text.strip()
+# 可通过 TRUTHSOCIAL_BASE_URL 指向本地替身服务器（truthbrush 使用模块级常量拼接 URL）
+if os.getenv('TRUTHSOCIAL_BASE_URL'):
+    truthbrush_api.API_BASE_URL = os.getenv('TRUTHSOCIAL_BASE_URL').rstrip('/') + '/api'
 
 def get_user_posts(handle, limit=20):
     """获取 Truth Social 用户的帖子"""
@@ -32,7 +27,12 @@ def get_user_posts(handle, limit=20):
         # 检查是否配置了 token
         token = os.getenv('TRUTHSOCIAL_TOKEN')
         if not token:
-            return {'error': 'Truth Social token not configured. Please set TRUTHSOCIAL_TOKEN environment variable.'}
+            return {'success': False, 'error': 'Truth Social token not configured. Please set TRUTHSOCIAL_TOKEN environment variable.'}
+        
+        # token 已知失效时直接返回，不等请求超时
+        cached_error = social_health.cached_failure('truthsocial', token)
+        if cached_error:
+            return {'success': False, 'error': cached_error}
         
         # 初始化 API 客户端（使用 token）
         os.environ['TRUTHSOCIAL_TOKEN'] = token
@@ -41,52 +41,29 @@ def get_user_posts(handle, limit=20):
         # 使用 lookup 方法获取用户信息
         user_info = client.lookup(handle)
         if not user_info:
-            return {'error': f'User @{handle} not found'}
+            return {'success': False, 'error': f'User @{handle} not found'}
         
         user_id = user_info.get('id')
         if not user_id:
-            return {'error': f'Could not get user ID for @{handle}'}
+            return {'success': False, 'error': f'Could not get user ID for @{handle}'}
         
-        # 使用 pull_statuses 方法获取用户的帖子
+        # 使用 pull_statuses 方法获取用户的帖子，转换为统一格式
+        author = social_models.user_from_mastodon(user_info)
         posts = []
         for status in client.pull_statuses(handle):
-            # 提取纯文本内容
-            content = strip_html(status.get('content', ''))
-            
-            post = {
-                'id': status.get('id', ''),
-                'text': content,
-                'created_at': status.get('created_at', ''),
-                'reblogs_count': status.get('reblogs_count', 0),
-                'favourites_count': status.get('favourites_count', 0),
-                'replies_count': status.get('replies_count', 0),
-                'url': status.get('url', ''),
-            }
-            
-            # 提取媒体
-            media_attachments = status.get('media_attachments', [])
-            if media_attachments:
-                post['media'] = [
-                    {
-                        'type': m.get('type', 'image'),
-                        'url': m.get('url', '')
-                    }
-                    for m in media_attachments
-                ]
-            
-            posts.append(post)
+            posts.append(social_models.post_from_mastodon(status, author))
             
             # 限制数量
             if len(posts) >= limit:
                 break
         
-        return {'posts': posts}
+        return social_models.posts_result(posts)
     except Exception as e:
-        return {'error': str(e)}
+        return {'success': False, 'error': str(e)}
 
 if __name__ == '__main__':
     if len(sys.argv) < 3:
-        print(json.dumps({'error': 'Usage: truthsocial_api_helper.py get_posts <handle> [limit]'}))
+        print(json.dumps({'success': False, 'error': 'Usage: truthsocial_api_helper.py get_posts <handle> [limit]'}))
         sys.exit(1)
     
     command = sys.argv[1]
@@ -95,7 +72,7 @@ if __name__ == '__main__':
         handle = sys.argv[2]
         limit = int(sys.argv[3]) if len(sys.argv) > 3 else 20
         result = get_user_posts(handle, limit)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        social_models.dump(result, sys.stdout)
     else:
-        print(json.dumps({'error': f'Unknown command: {command}'}))
+        print(json.dumps({'success': False, 'error': f'Unknown command: {command}'}))
         sys.exit(1)
@@ -6,9 +6,10 @@ import sys
 import json
 sys.path.append('/opt/.manus/.sandbox-runtime')
 from data_api import ApiClient
+import social_models
 
 def get_user_profile(username):
-    """获取 Twitter 用户信息"""
+    """获取 Twitter 用户信息（social_models.User）"""
     try:
         client = ApiClient()
         response = client.call_api('Twitter/get_user_profile_by_username', query={'username': username})
@@ -20,26 +21,13 @@ def get_user_profile(username):
         if not user_data:
             return None
             
-        core = user_data.get('core', {})
-        legacy = user_data.get('legacy', {})
-        avatar = user_data.get('avatar', {})
-        verification = user_data.get('verification', {})
-        
-        return {
-            'rest_id': user_data.get('rest_id', ''),
-            'screen_name': core.get('screen_name', username),
-            'name': core.get('name', legacy.get('name', username)),
-            'description': legacy.get('description'),
-            'followers_count': legacy.get('followers_count', 0),
-            'verified': verification.get('verified', False) or user_data.get('is_blue_verified', False),
-            'profile_image_url': avatar.get('image_url'),
-        }
+        return social_models.user_from_twitter_graphql(user_data)
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)
         return None
 
-def get_user_tweets(user_id, count=20, cursor=None):
-    """获取 Twitter 用户的推文"""
+def get_user_tweets(user_id, count=20, cursor=None, author=None):
+    """获取 Twitter 用户的推文，返回 (Post 列表, 下一页 cursor)"""
     try:
         client = ApiClient()
         query_params = {
@@ -53,9 +41,9 @@ def get_user_tweets(user_id, count=20, cursor=None):
         response = client.call_api('Twitter/get_user_tweets', query=query_params)
         
         if not response or 'result' not in response:
-            return {'tweets': [], 'nextCursor': None}
+            return [], None
             
-        tweets = []
+        posts = []
         next_cursor = None
         
         timeline = response.get('result', {}).get('timeline', {})
@@ -72,73 +60,51 @@ def get_user_tweets(user_id, count=20, cursor=None):
                         tweet_data = tweet_results.get('result', {})
                         
                         if tweet_data:
-                            legacy = tweet_data.get('legacy', {})
-                            tweet = {
-                                'id': legacy.get('id_str', tweet_data.get('rest_id', '')),
-                                'text': legacy.get('full_text', ''),
-                                'created_at': legacy.get('created_at', ''),
-                                'retweet_count': legacy.get('retweet_count', 0),
-                                'favorite_count': legacy.get('favorite_count', 0),
-                                'reply_count': legacy.get('reply_count', 0),
-                                'quote_count': legacy.get('quote_count', 0),
-                                'is_retweet': bool(legacy.get('retweeted_status_result')),
-                                'is_reply': bool(legacy.get('in_reply_to_status_id_str')),
-                            }
-                            
-                            # 提取媒体
-                            entities = legacy.get('entities', {})
-                            media = entities.get('media', [])
-                            if media:
-                                tweet['media'] = [
-                                    {
-                                        'type': m.get('type', 'photo'),
-                                        'url': m.get('media_url_https', m.get('media_url', ''))
-                                    }
-                                    for m in media
-                                ]
-                            
-                            tweets.append(tweet)
+                            posts.append(social_models.post_from_twitter_graphql(tweet_data, author))
                     elif entry_id.startswith('cursor-bottom-'):
                         cursor_content = entry.get('content', {})
                         if cursor_content.get('value'):
                             next_cursor = cursor_content['value']
         
-        return {'tweets': tweets, 'nextCursor': next_cursor}
+        return posts, next_cursor
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)
-        return {'tweets': [], 'nextCursor': None}
+        return [], None
 
 def get_tweets_by_username(username, count=20):
     """通过用户名获取推文（组合接口）"""
     try:
         # 首先获取用户信息
         user_profile = get_user_profile(username)
-        if not user_profile or not user_profile.get('rest_id'):
-            return []
+        if not user_profile or not user_profile.id:
+            return {'success': False, 'error': f'User @{username} not found'}
         
         # 然后获取推文
-        result = get_user_tweets(user_profile['rest_id'], count)
-        return result.get('tweets', [])
+        posts, next_cursor = get_user_tweets(user_profile.id, count, author=user_profile)
+        return social_models.posts_result(posts, next_cursor=next_cursor)
     except Exception as e:
-        print(f"Error: {str(e)}", file=sys.stderr)
-        return []
+        return {'success': False, 'error': str(e)}
 
 if __name__ == '__main__':
     if len(sys.argv) < 3:
-        print(json.dumps({'error': 'Usage: twitter_api_helper.py <command> <args>'}))
+        print(json.dumps({'success': False, 'error': 'Usage: twitter_api_helper.py <command> <args>'}))
         sys.exit(1)
     
     command = sys.argv[1]
     
     if command == 'get_profile':
         username = sys.argv[2]
-        result = get_user_profile(username)
-        print(json.dumps(result))
+        user_profile = get_user_profile(username)
+        if user_profile:
+            result = social_models.user_result(user_profile)
+        else:
+            result = {'success': False, 'error': f'User @{username} not found'}
+        social_models.dump(result, sys.stdout)
     elif command == 'get_tweets':
         username = sys.argv[2]
         count = int(sys.argv[3]) if len(sys.argv) > 3 else 20
         result = get_tweets_by_username(username, count)
-        print(json.dumps(result))
+        social_models.dump(result, sys.stdout)
     else:
-        print(json.dumps({'error': f'Unknown command: {command}'}))
+        print(json.dumps({'success': False, 'error': f'Unknown command: {command}'}))
         sys.exit(1)
@@ -7,18 +7,108 @@ import sys
 import json
 import os
 import asyncio
-from twikit import Client
+import importlib
+import subprocess
 from pathlib import Path
+import social_health
+import social_models
 
-# Cookie 文件路径
-COOKIES_FILE = Path(__file__).parent / '.twitter_cookies.json'
+# Cookie 文件路径（可通过 TWITTER_COOKIES_FILE 覆盖）
+COOKIES_FILE = Path(os.environ.get('TWITTER_COOKIES_FILE') or Path(__file__).parent / '.twitter_cookies.json')
 
-async def init_client():
-    """初始化 Twitter 客户端"""
-    client = Client('en-US')
+# 可通过 TWITTER_BASE_URL 把 x.com / abs.twimg.com 的请求指向本地替身服务器
+BASE_URL = os.environ.get('TWITTER_BASE_URL')
+
+# 后台重新登录的最小间隔，避免多个 helper 同时触发登录
+RELOGIN_INTERVAL = 5 * 60
+
+# twikit（连同 js2py / httpx）导入要 0.5 秒以上，只在缓存的健康检查之后按需导入，
+# 会话已知失效时几毫秒内就能返回
+
+async def import_twikit_async():
+    """在线程里导入 twikit：导入是同步的 CPU 工作，直接 import 会卡住事件循环，
+    person_feed 里同时进行的 Truth Social 请求要等它导入完才能继续"""
+    await asyncio.to_thread(importlib.import_module, 'twikit')
+
+def rebase_transport(base_url):
+    """把请求改写到 base_url 的 httpx transport，保留路径和查询参数"""
+    import httpx
+    
+    class RebaseTransport(httpx.AsyncHTTPTransport):
+        async def handle_async_request(self, request):
+            request.url = request.url.copy_with(
+                scheme=target.scheme,
+                host=target.host,
+                port=target.port,
+            )
+            return await super().handle_async_request(request)
+    
+    target = httpx.URL(base_url)
+    return RebaseTransport()
+
+def rebased_client_class(client_class):
+    """twikit Client 的构造函数会执行 self.proxy = None，proxy setter 会为 all:// 挂载一个默认 transport，
+    优先级高于传给 httpx 的 transport=；这个子类只在真正设置代理时才挂载"""
+    
+    class RebasedClient(client_class):
+        @property
+        def proxy(self):
+            return client_class.proxy.fget(self)
+        
+        @proxy.setter
+        def proxy(self, url):
+            if url:
+                client_class.proxy.fset(self, url)
+    
+    return RebasedClient
+
+def session_secret():
+    """当前会话的标识：cookie 里的 auth_token，重新登录后自然对应新的健康状态"""
+    try:
+        return json.loads(COOKIES_FILE.read_text()).get('auth_token', '')
+    except (OSError, ValueError):
+        return os.environ.get('TWITTER_EMAIL', '')
+
+def start_background_relogin():
+    """在后台进程里重新登录并刷新 cookie，不阻塞当前请求"""
+    if not os.environ.get('TWITTER_EMAIL') or not os.environ.get('TWITTER_PASSWORD'):
+        return False
+    
+    if not social_health.claim('twitter', 'relogin', RELOGIN_INTERVAL):
+        return False
+    
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), 'relogin'],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    return True
+
+def check_cached_session():
+    """会话已知失效时返回错误并触发后台重新登录，否则返回 None"""
+    cached_error = social_health.cached_failure('twitter', session_secret())
+    if cached_error:
+        start_background_relogin()
+    return cached_error
+
+def record_session_failure(error):
+    """记录会话失效（401/403）并触发后台重新登录"""
+    social_health.record_status('twitter', session_secret(), False, error=str(error)[:200])
+    start_background_relogin()
+
+async def init_client(fresh_login=False):
+    """初始化 Twitter 客户端（fresh_login=True 时忽略已保存的 cookie 重新登录）"""
+    from twikit import Client
+    
+    if BASE_URL:
+        client = rebased_client_class(Client)('en-US', transport=rebase_transport(BASE_URL), trust_env=False)
+    else:
+        client = Client('en-US')
     
     # 尝试从 cookie 文件加载
-    if COOKIES_FILE.exists():
+    if COOKIES_FILE.exists() and not fresh_login:
         try:
             client.load_cookies(str(COOKIES_FILE))
             return client
@@ -45,6 +135,13 @@ async def init_client():
 
 async def get_user_tweets_async(username, count=20):
     """获取用户的推文"""
+    cached_error = check_cached_session()
+    if cached_error:
+        return {'success': False, 'error': cached_error}
+    
+    await import_twikit_async()
+    from twikit.errors import Unauthorized, Forbidden
+    
     try:
         client = await init_client()
         
@@ -57,53 +154,27 @@ async def get_user_tweets_async(username, count=20):
         # 获取用户推文
         tweets = await user.get_tweets('Tweets', count=count)
         
-        # 转换为简化格式
-        tweet_list = []
-        for tweet in tweets:
-            tweet_data = {
-                'id': tweet.id,
-                'text': tweet.text,
-                'created_at': str(tweet.created_at) if hasattr(tweet, 'created_at') else '',
-                'retweet_count': tweet.retweet_count if hasattr(tweet, 'retweet_count') else 0,
-                'favorite_count': tweet.favorite_count if hasattr(tweet, 'favorite_count') else 0,
-                'reply_count': tweet.reply_count if hasattr(tweet, 'reply_count') else 0,
-                'quote_count': tweet.quote_count if hasattr(tweet, 'quote_count') else 0,
-                'is_retweet': hasattr(tweet, 'retweeted_tweet') and tweet.retweeted_tweet is not None,
-                'is_reply': hasattr(tweet, 'in_reply_to_user_id') and tweet.in_reply_to_user_id is not None,
-                'user': {
-                    'screen_name': user.screen_name,
-                    'name': user.name,
-                    'followers_count': user.followers_count if hasattr(user, 'followers_count') else 0,
-                    'verified': user.verified if hasattr(user, 'verified') else False,
-                }
-            }
-            
-            # 添加媒体信息
-            if hasattr(tweet, 'media') and tweet.media:
-                tweet_data['media'] = []
-                for media in tweet.media:
-                    media_obj = {'type': 'photo', 'url': ''}
-                    if hasattr(media, 'type'):
-                        media_obj['type'] = media.type
-                    if hasattr(media, 'media_url_https'):
-                        media_obj['url'] = media.media_url_https
-                    elif hasattr(media, 'url'):
-                        media_obj['url'] = media.url
-                    tweet_data['media'].append(media_obj)
-            
-            tweet_list.append(tweet_data)
-        
-        return {
-            'success': True,
-            'tweets': tweet_list,
-            'count': len(tweet_list)
-        }
+        # 转换为统一格式（所有推文共享同一个作者对象）
+        author = social_models.user_from_twikit(user)
+        posts = [social_models.post_from_twikit(tweet, author) for tweet in tweets]
+        
+        return social_models.posts_result(posts)
         
+    except (Unauthorized, Forbidden) as e:
+        record_session_failure(e)
+        return {'success': False, 'error': str(e)}
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
 async def get_user_info_async(username):
     """获取用户信息"""
+    cached_error = check_cached_session()
+    if cached_error:
+        return {'success': False, 'error': cached_error}
+    
+    await import_twikit_async()
+    from twikit.errors import Unauthorized, Forbidden
+    
     try:
         client = await init_client()
         
@@ -113,27 +184,58 @@ async def get_user_info_async(username):
         if not user:
             return {'success': False, 'error': f'User @{username} not found'}
         
-        user_data = {
-            'rest_id': user.id,
-            'screen_name': user.screen_name,
-            'name': user.name,
-            'description': user.description if hasattr(user, 'description') else '',
-            'followers_count': user.followers_count if hasattr(user, 'followers_count') else 0,
-            'friends_count': user.following_count if hasattr(user, 'following_count') else 0,
-            'statuses_count': user.statuses_count if hasattr(user, 'statuses_count') else 0,
-            'verified': user.verified if hasattr(user, 'verified') else False,
-            'profile_image_url': user.profile_image_url if hasattr(user, 'profile_image_url') else '',
-            'created_at': str(user.created_at) if hasattr(user, 'created_at') else '',
-        }
-        
-        return {
-            'success': True,
-            'user': user_data
-        }
+        return social_models.user_result(social_models.user_from_twikit(user))
         
+    except (Unauthorized, Forbidden) as e:
+        record_session_failure(e)
+        return {'success': False, 'error': str(e)}
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
+async def health_async(force=False, relogin=True):
+    """用最便宜的 account/settings 端点检查会话，结果带过期时间缓存到状态文件
+    relogin=False 时会话失效也不触发后台重新登录（重新登录进程自己做检查时用，避免循环登录）"""
+    secret = session_secret()
+    
+    if not force:
+        cached = social_health.get_status('twitter', secret)
+        if cached:
+            return {'success': cached['healthy'], 'cached': True, **cached}
+    
+    await import_twikit_async()
+    from twikit.errors import Unauthorized, Forbidden
+    
+    try:
+        client = await init_client()
+        settings, _ = await client.v11.settings()
+    except (Unauthorized, Forbidden) as e:
+        entry = social_health.record_status('twitter', secret, False, error=str(e)[:200])
+        if relogin:
+            start_background_relogin()
+        return {'success': False, 'cached': False, **entry}
+    except Exception as e:
+        # 网络错误不能说明会话失效，不写入缓存
+        return {'success': False, 'healthy': False, 'cached': False, 'error': str(e)}
+    
+    # 保存服务端刷新过的 cookie（ct0 等）
+    client.save_cookies(str(COOKIES_FILE))
+    
+    entry = social_health.record_status(
+        'twitter', session_secret(), True,
+        account=settings.get('screen_name', '')
+    )
+    return {'success': True, 'cached': False, **entry}
+
+async def relogin_async():
+    """丢弃失效的 cookie 重新登录，保存新 cookie 后重新做健康检查
+    新会话仍然失效（账号被锁、ct0 不对等）时只记录结果，不再触发下一轮登录"""
+    try:
+        await init_client(fresh_login=True)
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+    
+    return await health_async(force=True, relogin=False)
+
 def get_user_tweets(username, count=20):
     """同步包装器"""
     return asyncio.run(get_user_tweets_async(username, count))
@@ -149,6 +251,13 @@ def main():
     
     command = sys.argv[1]
     
+    if command in ('get_tweets', 'get_user_info'):
+        # 会话已知失效时在导入 twikit 之前就返回
+        cached_error = check_cached_session()
+        if cached_error:
+            print(json.dumps({'success': False, 'error': cached_error}))
+            return
+    
     if command == 'get_tweets':
         if len(sys.argv) < 3:
             print(json.dumps({'success': False, 'error': 'Username required'}))
@@ -166,10 +275,16 @@ def main():
         username = sys.argv[2]
         result = get_user_info(username)
         
+    elif command == 'health':
+        result = asyncio.run(health_async(force='--force' in sys.argv[2:]))
+        
+    elif command == 'relogin':
+        result = asyncio.run(relogin_async())
+        
     else:
         result = {'success': False, 'error': f'Unknown command: {command}'}
     
-    print(json.dumps(result, default=str))
+    social_models.dump(result, sys.stdout)
 
 if __name__ == '__main__':
     main()
@@ -33,15 +33,15 @@ try:
     api = Api(token=token)
     print("✓ Truth Social API client created successfully")
     
-    # Test by looking up a user (e.g., realDonaldTrump)
-    print("\nAttempting to lookup user 'realDonaldTrump'...")
-    user_info = api.lookup("realDonaldTrump")
-    print(f"✓ Successfully looked up user: {user_info.get('display_name', 'Unknown')}")
-    print(f"   Username: @{user_info.get('username', 'unknown')}")
-    print(f"   Followers: {user_info.get('followers_count', 0):,}")
+    # 用最便宜的 verify_credentials 端点验证 token（不再完整查询用户）
+    print("\nVerifying token with accounts/verify_credentials...")
+    account = api._get("/v1/accounts/verify_credentials")
+    if not account or 'id' not in account:
+        raise Exception(f"Token rejected: {account}")
+    print(f"✓ Token belongs to: @{account.get('username', 'unknown')}")
     
-    # Verify we can access basic user info
-    print("\n✓ Truth Social API can successfully query user information")
+    # Verify the token is accepted
+    print("\n✓ Truth Social API accepts the token")
     
 except Exception as e:
     print(f"✗ Error testing Truth Social API: {e}")